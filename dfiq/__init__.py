@@ -1,6 +1,7 @@
 from .dfiq import DFIQ, Scenario, Facet, Question, Approach
+from .mapped import MappedDFIQ
 
-__all__ = ["DFIQ", "Scenario", "Facet", "Question", "Approach"]
+__all__ = ["DFIQ", "MappedDFIQ", "Scenario", "Facet", "Question", "Approach"]
 __version__ = "1.0.1"
 __author__ = "Ryan Benson"
 __email__ = "ryan@dfir.blog"
@@ -0,0 +1,85 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from typing import Iterable
+
+# Matches a {variable} to be substituted in an analysis step's value.
+STEP_VARIABLE_PATTERN = re.compile(r"\{[A-z0-9_ -]{2,}?\}")
+
+# The fields an Approach can be looked up by, and what their keys are:
+#   data_type: a `view.data` type (like "ForensicArtifact")
+#   data: a (type, value) pair from `view.data` (like ("ForensicArtifact", "BrowserHistory"))
+#   processor: a processor name (like "Plaso")
+#   analysis: a (processor name, analysis name) pair (like ("Plaso", "OpenSearch"))
+#   step_type: an analysis step type, usually a query language (like "opensearch-query")
+#   variable: a {variable} used in an analysis step value (like "{hostname}")
+CATALOG_FIELDS = ("data_type", "data", "processor", "analysis", "step_type", "variable")
+
+
+class StepCatalog(object):
+    """An index of the data, processors, and analysis steps used by Approaches.
+
+    For each field in CATALOG_FIELDS, this maps every value seen in an Approach's
+    `view` to the sorted IDs of the Approaches that use it. It backs the Approach
+    Glossary and reverse lookups, like finding the Approaches that use a given
+    ForensicArtifact.
+
+    Attributes:
+        entries (dict): Maps each field to a dict of {key: sorted Approach IDs}.
+    """
+
+    def __init__(self) -> None:
+        self.entries = {field: {} for field in CATALOG_FIELDS}
+
+    @classmethod
+    def from_approaches(cls, approaches: Iterable) -> "StepCatalog":
+        """Build a catalog from Approaches."""
+        catalog = cls()
+        for approach in sorted(approaches, key=lambda x: x.id):
+            for field, key in cls._iter_keys(approach.view):
+                postings = catalog.entries[field].setdefault(key, [])
+                # Approaches are added in ID order, so only the last ID can repeat.
+                if not postings or postings[-1] != approach.id:
+                    postings.append(approach.id)
+        return catalog
+
+    @staticmethod
+    def _iter_keys(view: dict | None) -> Iterable[tuple[str, str | tuple]]:
+        """Yield the (field, key) pairs used in an Approach's `view`."""
+        view = view or {}
+        for data in view.get("data") or []:
+            yield "data_type", data["type"]
+            yield "data", (data["type"], data["value"])
+
+        for processor in view.get("processors") or []:
+            yield "processor", processor["name"]
+            for analysis in processor.get("analysis") or []:
+                yield "analysis", (processor["name"], analysis["name"])
+                for step in analysis.get("steps") or []:
+                    yield "step_type", step["type"]
+                    for variable in STEP_VARIABLE_PATTERN.findall(step["value"]):
+                        yield "variable", variable
+
+    def get(self, field: str, key: str | tuple) -> list[str]:
+        """Returns the sorted IDs of the Approaches using a key in a field."""
+        if field not in self.entries:
+            raise ValueError(f"Unknown step catalog field {field}")
+        return self.entries[field].get(key, [])
+
+    def keys(self, field: str) -> list:
+        """Returns every key seen in a field."""
+        if field not in self.entries:
+            raise ValueError(f"Unknown step catalog field {field}")
+        return list(self.entries[field])
@@ -0,0 +1,136 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def validate(args: argparse.Namespace) -> int:
+    """Validate a DFIQ corpus, print the report, and return the exit code."""
+    from .validate import validate_corpus
+
+    report = validate_corpus(args.yaml_data_path, workers=args.workers)
+    if args.format == "json":
+        output = json.dumps(report, indent=2)
+    else:
+        lines = [
+            f"{error['path']}: {error['check']}: {error['message']}"
+            for error in report["errors"]
+        ]
+        lines.append(
+            f"{len(report['errors'])} errors in {report['files']} files "
+            f"({report['seconds']:.2f} s)"
+        )
+        output = "\n".join(lines)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    return 0 if report["valid"] else 1
+
+
+def diff(args: argparse.Namespace) -> int:
+    """Diff two versions of a DFIQ corpus, print the changes, and return 0."""
+    from .dfiq import DFIQ
+
+    old = DFIQ(args.old_yaml_data_path)
+    new = DFIQ(args.new_yaml_data_path)
+    changes = old.diff(new)
+    if args.format == "json":
+        output = json.dumps(changes.to_dict(), indent=2)
+    else:
+        lines = []
+        for change in changes.changes:
+            line = f"{change.kind} {change.type} {change.id}"
+            if change.old_id:
+                line = f"{change.kind} {change.type} {change.old_id} -> {change.id}"
+            if change.fields:
+                line += f" ({', '.join(change.fields)})"
+            lines.append(line)
+        lines.extend(
+            f"+ {parent} -> {child}" for parent, child in sorted(changes.edges_added)
+        )
+        lines.extend(
+            f"- {parent} -> {child}" for parent, child in sorted(changes.edges_removed)
+        )
+        lines.append(
+            f"{len(changes.changes)} components changed, "
+            f"{len(changes.edges_added)} edges added, "
+            f"{len(changes.edges_removed)} edges removed"
+        )
+        output = "\n".join(lines)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="dfiq", description="DFIQ tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = subparsers.add_parser(
+        "validate",
+        help="Validate the YAML files of a DFIQ corpus and the references between them.",
+    )
+    validate_parser.add_argument(
+        "yaml_data_path",
+        help="The base path holding the scenarios, facets, questions, and approaches "
+        "subdirectories.",
+    )
+    validate_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Validate files using a pool of this many worker processes.",
+    )
+    validate_parser.add_argument(
+        "--format",
+        choices=["json", "text"],
+        default="json",
+        help="The format of the report.",
+    )
+    validate_parser.add_argument(
+        "--output", help="Write the report to this file (defaults to stdout)."
+    )
+    validate_parser.set_defaults(function=validate)
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="List the components and hierarchy edges that changed between two "
+        "versions of a DFIQ corpus.",
+    )
+    diff_parser.add_argument("old_yaml_data_path", help="The older corpus.")
+    diff_parser.add_argument("new_yaml_data_path", help="The newer corpus.")
+    diff_parser.add_argument(
+        "--format",
+        choices=["json", "text"],
+        default="json",
+        help="The format of the changes.",
+    )
+    diff_parser.add_argument(
+        "--output", help="Write the changes to this file (defaults to stdout)."
+    )
+    diff_parser.set_defaults(function=diff)
+
+    args = parser.parse_args(argv)
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
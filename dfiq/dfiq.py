@@ -12,20 +12,112 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import importlib.resources
-import jinja2
+from __future__ import annotations
+
+import functools
+import hashlib
+import heapq
+import json
 import logging
-import networkx as nx
+import math
 import os
-import re
-import yamale
-import yaml
+import pickle
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from .catalog import StepCatalog
+from .diff import DFIQDiff, diff_components, get_content_hash
+from .hierarchy import Hierarchy
+from .matcher import ArtifactMatcher
+from .search import SearchIndex
+from .stats import LoadStats
+from .viewmodels import (
+    ApproachViewModel,
+    FacetViewModel,
+    QuestionViewModel,
+    ScenarioViewModel,
+)
 
+# Heavy dependencies (PyYAML, Yamale, Jinja2, and the multiprocessing machinery)
+# are imported where they are first used, so that `import dfiq` (and loading
+# components from a cache) stays fast.
+if TYPE_CHECKING:
+    import jinja2
+    import yamale
 
-logging.basicConfig(
-    level=logging.DEBUG, format="%(filename)s | %(levelname)s | %(message)s"
-)
+# Bump this whenever the layout of the on-disk corpus cache (or of the pickled
+# component classes) changes, so stale caches are ignored.
+CACHE_FORMAT_VERSION = 3
+
+# Bump this whenever the way site pages' inputs are hashed changes.
+SITE_MANIFEST_VERSION = 1
+
+
+def __getattr__(name: str):
+    """Provide YAML_LOADER lazily, as it requires importing PyYAML."""
+    if name == "YAML_LOADER":
+        return _get_yaml_loader()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_yaml_loader() -> type:
+    """Returns the YAML loader to use, preferring the much faster libyaml-backed one."""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _intern(value):
+    """Intern a string, so equal strings share one object; return anything else as-is."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_strings(value):
+    """Returns a copy of a nested structure of dicts and lists with its strings interned.
+
+    Used on Approaches' `view`s, where the same keys ("type", "value") and values
+    (artifact and processor names) repeat many times across components.
+    """
+    # This runs on every value of every Approach, so check exact types (YAML and
+    # JSON only produce plain str, dict, and list) rather than using isinstance().
+    value_type = type(value)
+    if value_type is str:
+        return sys.intern(value)
+    if value_type is dict:
+        return {
+            sys.intern(key) if type(key) is str else key: _intern_strings(item)
+            for key, item in value.items()
+        }
+    if value_type is list:
+        return [_intern_strings(item) for item in value]
+    return value
+
+
+def _intern_frozenset(values) -> frozenset:
+    """Returns a frozenset of the values, with its strings interned."""
+    return frozenset(_intern(value) for value in values) if values else frozenset()
+
+
+def _intern_tuple(values) -> tuple:
+    """Returns a tuple of the values, with its strings interned."""
+    return tuple(_intern(value) for value in values) if values else ()
+
+
+def _timed(phase: str) -> Callable:
+    """Decorates a DFIQ method to add the time spent in it to a phase of `stats`."""
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.stats.phase(phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 class Component(object):
@@ -35,20 +127,38 @@ class Component(object):
     entities: Scenarios, Facets, Questions, and Approaches. This base class
     defines the attributes that all components share.
 
+    To keep memory use low when many components are loaded, components use
+    __slots__, and their tags and parent IDs are immutable collections of interned
+    strings that are shared between components with equal values.
+
     Attributes:
         id (str): The unique ID of the component, as described at dfiq.org/spec.
         name (str): The name of the component, often in the form of a question.
         description (str, optional): A few sentence description of the component.
         type (str, optional): The type of component.
-        tags (set[str], optional): A set of tags associated with the component.
-        parent_ids (set[str], optional): A set of IDs of the component's parents.
-        child_ids (set[str], optional): A set of IDs of the component's children.
+        tags (tuple[str]): The tags associated with the component, in file order.
+        all_tags (frozenset[str]): The component's tags, plus those of its Approaches.
+        parent_ids (frozenset[str]): The IDs of the component's parents.
+        child_ids (list[str], optional): The sorted IDs of the component's children.
         is_internal (bool): Whether the component is private and for internal use only.
 
     Methods:
         set_children(child_ids: set[str]): Sets the component's children.
     """
 
+    __slots__ = (
+        "id",
+        "uuid",
+        "name",
+        "description",
+        "type",
+        "tags",
+        "all_tags",
+        "parent_ids",
+        "child_ids",
+        "is_internal",
+    )
+
     def __init__(
         self,
         dfiq_id: str,
@@ -58,24 +168,17 @@ class Component(object):
         tags: set[str] | None = None,
         parent_ids: set[str] | None = None,
     ) -> None:
-        self.id = dfiq_id
+        self.id = sys.intern(dfiq_id)
         self.uuid = uuid
         self.name = name.rstrip()
         self.description = description
         self.type = None
-        self.tags = tags
-        self.parent_ids = parent_ids
+        self.tags = _intern_tuple(tags)
+        self.all_tags = frozenset(self.tags)
+        self.parent_ids = _intern_frozenset(parent_ids)
         self.child_ids = None
         self.is_internal = False
 
-        if not self.tags:
-            self.tags = set()
-
-        self.all_tags = set(self.tags)
-
-        if not self.parent_ids:
-            self.parent_ids = set()
-
         if isinstance(description, str):
             self.description = description.rstrip()
 
@@ -100,6 +203,8 @@ class Approach(Component):
         type (str): The type of component, which is always "approach".
     """
 
+    __slots__ = ("view",)
+
     def __init__(
         self,
         dfiq_id: str,
@@ -112,7 +217,7 @@ class Approach(Component):
         super().__init__(
             dfiq_id, uuid, name, description, tags, parent_ids={dfiq_id.split(".")[0]}
         )
-        self.view = view
+        self.view = _intern_strings(view)
         self.type = "approach"
 
         if self.id[6] == "0":
@@ -130,6 +235,8 @@ class Question(Component):
         type (str): The type of component, which is always "question".
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         dfiq_id: str,
@@ -143,7 +250,7 @@ class Question(Component):
         self.type = "question"
 
     @property
-    def approaches(self) -> set[str]:
+    def approaches(self) -> list[str]:
         """All Approaches associated with a given Question."""
         return self.child_ids
 
@@ -160,6 +267,8 @@ class Facet(Component):
         type (str): The type of component, which is always "facet".
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         dfiq_id: str,
@@ -173,7 +282,7 @@ class Facet(Component):
         self.type = "facet"
 
     @property
-    def questions(self) -> set[str]:
+    def questions(self) -> list[str]:
         """All Questions associated with a given Facet."""
         return self.child_ids
 
@@ -189,14 +298,21 @@ class Scenario(Component):
         type (str): The type of component, which is always "scenario".
     """
 
+    __slots__ = ()
+
     def __init__(
-        self, dfiq_id: str, uuid: str, name: str, description: str, tags: set[str] | None
+        self,
+        dfiq_id: str,
+        uuid: str,
+        name: str,
+        description: str,
+        tags: set[str] | None,
     ):
         super().__init__(dfiq_id, uuid, name, description, tags)
         self.type = "scenario"
 
     @property
-    def facets(self) -> set[str]:
+    def facets(self) -> list[str]:
         """All Facets associated with a given Scenario."""
         return self.child_ids
 
@@ -216,10 +332,42 @@ class DFIQ:
             plural forms.
         components (dict): A dictionary mapping from DFIQ component IDs to their
             corresponding components.
-        graph (nx.DiGraph, optional): A directed graph representing the relationships
+        graph (Hierarchy, optional): A directed graph representing the relationships
             between DFIQ components.
+        step_catalog (StepCatalog): An index of the data, processors, and analysis
+            steps used by Approaches, built on first use (and after Approaches are
+            reloaded).
         jinja_env (jinja2.Environment): A Jinja2 environment used to generate Markdown
-            files.
+            files. It is created the first time it is used.
+        single_parse (bool): Whether each YAML file is read and parsed only once, with
+            the parsed object reused for both schema validation and conversion. If
+            False, files are parsed separately for each step (the legacy behavior).
+        workers (int, optional): The number of worker processes used to parse and
+            validate YAML files. If not set (or 1), files are loaded serially.
+        cache_dir (Path, optional): A directory used to cache the loaded components
+            and graph between runs. Cached entries are reused for files whose
+            modification time and size (or, failing that, content hash) are
+            unchanged, and the whole cache is discarded if the schemas change. The
+            cache is a pickle file, so the directory must be trusted.
+        site_manifest (dict, optional): While generating the site incrementally, maps
+            each output page (relative to markdown_output_path) to a hash of the
+            inputs it was rendered from. Pages whose inputs are unchanged are skipped.
+        template_cache_dir (Path, optional): A directory used to persist compiled
+            Jinja2 templates (as bytecode) between processes, so short-lived jobs
+            don't need to compile the templates from source each time.
+        auto_reload_templates (bool): Whether Jinja2 checks if a template's source
+            changed each time the template is used. This can be turned off in
+            production, where the templates do not change.
+        streaming (bool): Whether to load the YAML files one at a time, adding each
+            component to the graph as it is loaded (see
+            load_dfiq_items_from_stream()), instead of loading every file before
+            building the graph. This lowers peak memory use for large corpora.
+            Ignored if `cache_dir` is set.
+        snapshot_path (Path, optional): A snapshot written by export() to load the
+            components from, instead of YAML files (see from_snapshot()).
+        stats (LoadStats): Timers and counters for each phase of loading (and
+            reloading) the knowledge base. Set `per_file_stats` to also time each
+            YAML file, and `stats_hook` to be called with each measurement.
     """
 
     def __init__(
@@ -227,8 +375,20 @@ class DFIQ:
         yaml_data_path: Path | str | None = None,
         markdown_output_path: Path | str | None = None,
         templates_path: Path | str | None = Path("../templates"),
+        single_parse: bool = True,
+        workers: int | None = None,
+        cache_dir: Path | str | None = None,
+        template_cache_dir: Path | str | None = None,
+        auto_reload_templates: bool = True,
+        streaming: bool = False,
+        snapshot_path: Path | str | None = None,
+        per_file_stats: bool = False,
+        stats_hook: Callable[[str, str, float], None] | None = None,
     ) -> None:
         self.yaml_data_path = yaml_data_path
+        self.single_parse = single_parse
+        self.workers = workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.markdown_output_path = markdown_output_path
         if self.markdown_output_path:
             self.markdown_output_path = Path(self.markdown_output_path)
@@ -240,11 +400,41 @@ class DFIQ:
         }
         self.components = {}
         self.graph = None
+        # Maps each loaded YAML file's absolute path to a tuple of
+        # (dfiq_type, mtime_ns, size, sha256 or None, component or None).
+        self._source_files = {}
+        self._fingerprints = {}
+        # Built on first use by diff().
+        self._content_hashes = None
+        self._indexes = {}
+        self._tag_indexes = {}
+        # Built on first use by the step_catalog property.
+        self._step_catalog = None
+        self._artifact_matchers = {}
+        # Built on first use by build_closures().
+        self._descendants = None
+        self._ancestors = None
+        self._search_index = None
+        # Built on first use by get_view_model().
+        self._view_models = {}
+        # Equal tag and ID collections are shared by all components that have
+        # them, since the same few values ("Windows", "Plaso", a popular Facet ID)
+        # repeat many times. See _share().
+        self._shared_values = {}
+        self._shared_values_pruned_size = 0
+        self._template_digests = {}
+        self.site_manifest = None
         self.templates_path = Path(templates_path)
-        logging.debug(f'"templates_path" set to "{self.templates_path.resolve()}"')
-        self.jinja_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(templates_path), trim_blocks=True
+        self.template_cache_dir = (
+            Path(template_cache_dir) if template_cache_dir else None
         )
+        self.auto_reload_templates = auto_reload_templates
+        self.streaming = streaming
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.stats = LoadStats(per_file=per_file_stats, hook=stats_hook)
+        logging.debug(f'"templates_path" set to "{self.templates_path.resolve()}"')
+        self._jinja_env = None
+        # Compiled on first use by _get_schema().
         self.schemas = {
             "Scenario": None,
             "Facet": None,
@@ -256,40 +446,545 @@ class DFIQ:
             self.yaml_data_path = Path(self.yaml_data_path)
             logging.info(f'"yaml_data_path" set to "{self.yaml_data_path.resolve()}"')
 
-        self._load_dfiq_schema()
-        self.load_dfiq_items_from_yaml()
-        self.build_graph()
-        self.add_child_ids()
-        self.add_child_tags()
+        self._load()
+
+    @_timed("load")
+    def _load(self) -> None:
+        """Load the components and build the graph and indexes, as set up in __init__."""
+        if self.snapshot_path:
+            self.load_dfiq_items_from_snapshot()
+            self.build_graph()
+            self.add_child_ids()
+            self.add_child_tags()
+        elif self.cache_dir:
+            self.load_dfiq_items_with_cache()
+        elif self.streaming:
+            self.load_dfiq_items_from_stream()
+            self.add_child_ids()
+            self.add_child_tags()
+        else:
+            self.load_dfiq_items_from_yaml()
+            self.build_graph()
+            self.add_child_ids()
+            self.add_child_tags()
+        for component in self.components.values():
+            self._share_component_values(component)
+        self._shared_values_pruned_size = len(self._shared_values)
+        self.build_indexes()
+
+    def _share(self, values: tuple | frozenset) -> tuple | frozenset:
+        """Returns an equal tuple or frozenset already in use, or else `values`."""
+        return self._shared_values.setdefault(values, values)
+
+    def _share_component_values(
+        self, component: Scenario | Facet | Question | Approach
+    ) -> None:
+        """Share a component's tag and parent ID collections with equal ones."""
+        component.tags = self._share(component.tags)
+        component.all_tags = self._share(component.all_tags)
+        component.parent_ids = self._share(component.parent_ids)
 
-    def scenarios(self) -> list[Scenario]:
-        """Returns a list of all Scenarios in the DFIQ knowledge base."""
-        return sorted(
-            [c for c in self.components.values() if isinstance(c, Scenario)],
-            key=lambda x: x.id,
-        )
+    def _prune_shared_values(self) -> None:
+        """Forget the shared collections no longer used by any component or closure.
 
-    def facets(self) -> list[Facet]:
-        """Returns a list of all Facets in the DFIQ knowledge base."""
-        return sorted(
-            [c for c in self.components.values() if isinstance(c, Facet)],
-            key=lambda x: x.id,
-        )
+        Reloading replaces components' collections, so this runs whenever the
+        shared collections have doubled in number since they were last pruned.
+        """
+        self._shared_values = {}
+        for component in self.components.values():
+            self._share_component_values(component)
+        for closures in (self._descendants, self._ancestors):
+            for dfiq_id, closure in (closures or {}).items():
+                closures[dfiq_id] = self._share(closure)
+        self._shared_values_pruned_size = len(self._shared_values)
+
+    def __getstate__(self) -> dict:
+        """Pickle everything except the Jinja environment (which can't be pickled)."""
+        state = self.__dict__.copy()
+        state["_jinja_env"] = None
+        return state
 
-    def questions(self) -> list[Question]:
-        """Returns a list of all Questions in the DFIQ knowledge base."""
-        return sorted(
-            [c for c in self.components.values() if isinstance(c, Question)],
-            key=lambda x: x.id,
+    @property
+    def jinja_env(self) -> jinja2.Environment:
+        """The Jinja2 environment used to generate Markdown files."""
+        if self._jinja_env is None:
+            self._jinja_env = self._make_jinja_env()
+        return self._jinja_env
+
+    @jinja_env.setter
+    def jinja_env(self, jinja_env: jinja2.Environment | None) -> None:
+        self._jinja_env = jinja_env
+
+    def _make_jinja_env(self) -> jinja2.Environment:
+        """Create the Jinja2 environment used to generate Markdown files."""
+        import jinja2
+
+        bytecode_cache = None
+        if self.template_cache_dir:
+            self.template_cache_dir.mkdir(exist_ok=True, parents=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(
+                str(self.template_cache_dir)
+            )
+
+        return jinja2.Environment(
+            loader=jinja2.FileSystemLoader(self.templates_path),
+            trim_blocks=True,
+            bytecode_cache=bytecode_cache,
+            auto_reload=self.auto_reload_templates,
         )
 
-    def approaches(self) -> list[Approach]:
-        """Returns a list of all Approaches in the DFIQ knowledge base."""
-        return sorted(
-            [c for c in self.components.values() if isinstance(c, Approach)],
-            key=lambda x: x.id,
+    def scenarios(self, include_internal: bool = True) -> list[Scenario]:
+        """Returns a list of all Scenarios in the DFIQ knowledge base, sorted by ID.
+
+        The list is shared by all callers and should not be modified.
+
+        Args:
+            include_internal (bool): Whether to include internal Scenarios.
+        """
+        return self._get_index("scenario", include_internal)
+
+    def facets(self, include_internal: bool = True) -> list[Facet]:
+        """Returns a list of all Facets in the DFIQ knowledge base, sorted by ID.
+
+        The list is shared by all callers and should not be modified.
+
+        Args:
+            include_internal (bool): Whether to include internal Facets.
+        """
+        return self._get_index("facet", include_internal)
+
+    def questions(
+        self, include_internal: bool = True, with_approaches_only: bool = False
+    ) -> list[Question]:
+        """Returns a list of all Questions in the DFIQ knowledge base, sorted by ID.
+
+        The list is shared by all callers and should not be modified.
+
+        Args:
+            include_internal (bool): Whether to include internal Questions.
+            with_approaches_only (bool): Whether to only include Questions that have
+                at least one Approach.
+        """
+        return self._get_index("question", include_internal, with_approaches_only)
+
+    def approaches(self, include_internal: bool = True) -> list[Approach]:
+        """Returns a list of all Approaches in the DFIQ knowledge base, sorted by ID.
+
+        The list is shared by all callers and should not be modified.
+
+        Args:
+            include_internal (bool): Whether to include internal Approaches.
+        """
+        return self._get_index("approach", include_internal)
+
+    @_timed("indexes")
+    def build_indexes(self, component_types: set[str] | None = None) -> None:
+        """Build the sorted, per-type lists returned by scenarios(), facets(), etc.
+
+        This runs automatically after loading and reloading. Call it again after
+        changing `components` directly.
+
+        Args:
+            component_types (set[str], optional): Only rebuild the indexes of these
+                component types (like "question"). Defaults to all types.
+        """
+        if component_types is None:
+            component_types = {"scenario", "facet", "question", "approach"}
+
+        components_by_type = {component_type: [] for component_type in component_types}
+        for component in self.components.values():
+            if component.type in components_by_type:
+                components_by_type[component.type].append(component)
+
+        for component_type, components in components_by_type.items():
+            components.sort(key=lambda x: x.id)
+            public_components = [c for c in components if not c.is_internal]
+            index = {
+                (True, False): components,
+                (False, False): public_components,
+            }
+            if component_type == "question":
+                index[(True, True)] = [c for c in components if c.approaches]
+                index[(False, True)] = [c for c in public_components if c.approaches]
+            self._indexes[component_type] = index
+
+            # Components are already sorted, so each tag's list of IDs is too.
+            tag_index = {}
+            for component in components:
+                for tag in component.all_tags:
+                    tag_index.setdefault(tag, []).append(component.id)
+            self._tag_indexes[component_type] = tag_index
+
+            if component_type == "approach":
+                self._step_catalog = None
+
+    @property
+    def tag_index(self) -> dict[str, dict[str, list[str]]]:
+        """An inverted index mapping each tag to the sorted IDs of the components
+        (split by component type) that have that tag in their `all_tags`."""
+        tag_index = {}
+        for component_type, type_tag_index in self._tag_indexes.items():
+            for tag, dfiq_ids in type_tag_index.items():
+                tag_index.setdefault(tag, {})[component_type] = dfiq_ids
+        return tag_index
+
+    def find(
+        self,
+        tags_all: list[str] | set[str] | None = None,
+        tags_any: list[str] | set[str] | None = None,
+        component_type: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Find components by their tags, using the tag index.
+
+        Tags are matched against each component's `all_tags` (so a Question matches
+        the tags of its Approaches, too).
+
+        Args:
+            tags_all (list[str], optional): Only return components with all these tags.
+            tags_any (list[str], optional): Only return components with at least one
+                of these tags.
+            component_type (str, optional): Only return components of this type (like
+                "question"). Defaults to all types.
+            include_internal (bool): Whether to include internal components.
+
+        Returns:
+            The matching components, sorted by type and then ID.
+        """
+        if component_type:
+            if component_type not in ("scenario", "facet", "question", "approach"):
+                raise ValueError(f"Unknown component type {component_type}")
+            component_types = [component_type]
+        else:
+            component_types = ["scenario", "facet", "question", "approach"]
+
+        results = []
+        for component_type in component_types:
+            if component_type not in self._tag_indexes:
+                self.build_indexes({component_type})
+            tag_index = self._tag_indexes[component_type]
+
+            if tags_all or tags_any:
+                postings = [tag_index.get(tag, []) for tag in tags_all or []]
+                if tags_any:
+                    postings.append(
+                        self._union_sorted([tag_index.get(tag, []) for tag in tags_any])
+                    )
+                dfiq_ids = self._intersect_sorted(postings)
+                matches = [self.components[dfiq_id] for dfiq_id in dfiq_ids]
+            else:
+                matches = self._get_index(component_type)
+
+            if not include_internal:
+                matches = [c for c in matches if not c.is_internal]
+            results.extend(matches)
+        return results
+
+    def find_approaches(
+        self,
+        data_type: str | None = None,
+        data_value: str | None = None,
+        processor: str | None = None,
+        analysis: str | None = None,
+        step_type: str | None = None,
+        variable: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Approach]:
+        """Find Approaches by what their `view` uses, using the step catalog.
+
+        For example, find_approaches("ForensicArtifact", "NTFSUSNJournal") returns
+        the Approaches that use that ForensicArtifact. Approaches must match all
+        the given arguments.
+
+        Args:
+            data_type (str, optional): A `view.data` type (like "ForensicArtifact").
+            data_value (str, optional): A `view.data` value of that `data_type`.
+            processor (str, optional): A processor name (like "Plaso").
+            analysis (str, optional): An analysis name of that `processor`.
+            step_type (str, optional): An analysis step type (like "opensearch-query").
+            variable (str, optional): A variable used in an analysis step's value,
+                including its braces (like "{hostname}").
+            include_internal (bool): Whether to include internal Approaches.
+
+        Returns:
+            The matching Approaches, sorted by ID.
+        """
+        if data_value is not None and data_type is None:
+            raise ValueError("data_value requires a data_type")
+        if analysis is not None and processor is None:
+            raise ValueError("analysis requires a processor")
+
+        criteria = {
+            "data_type": data_type if data_value is None else None,
+            "data": (data_type, data_value) if data_value is not None else None,
+            "processor": processor if analysis is None else None,
+            "analysis": (processor, analysis) if analysis is not None else None,
+            "step_type": step_type,
+            "variable": variable,
+        }
+        postings = [
+            self.step_catalog.get(field, key)
+            for field, key in criteria.items()
+            if key is not None
+        ]
+        if postings:
+            matches = [
+                self.components[dfiq_id] for dfiq_id in self._intersect_sorted(postings)
+            ]
+        else:
+            matches = self._get_index("approach")
+
+        if not include_internal:
+            matches = [c for c in matches if not c.is_internal]
+        return matches
+
+    def find_questions(
+        self, include_internal: bool = True, **criteria
+    ) -> list[Question]:
+        """Find the Questions that have Approaches matching find_approaches() criteria.
+
+        For example, find_questions(data_type="ForensicArtifact",
+        data_value="NTFSUSNJournal") returns the Questions that can be answered using
+        that ForensicArtifact.
+
+        Args:
+            include_internal (bool): Whether to include internal Questions (and to
+                consider internal Approaches).
+            **criteria: The arguments for find_approaches().
+
+        Returns:
+            The matching Questions, sorted by ID.
+        """
+        question_ids = set()
+        for approach in self.find_approaches(
+            include_internal=include_internal, **criteria
+        ):
+            question_ids.update(approach.parent_ids)
+
+        questions = []
+        for question_id in sorted(question_ids):
+            question = self.components.get(question_id)
+            if not isinstance(question, Question) or (
+                not include_internal and question.is_internal
+            ):
+                continue
+            questions.append(question)
+        return questions
+
+    def artifact_matcher(self, include_internal: bool = True) -> ArtifactMatcher:
+        """Returns an ArtifactMatcher for this knowledge base, building it if needed.
+
+        Args:
+            include_internal (bool): Whether to match internal components.
+        """
+        if include_internal not in self._artifact_matchers:
+            self._artifact_matchers[include_internal] = ArtifactMatcher.from_dfiq(
+                self, include_internal
+            )
+        return self._artifact_matchers[include_internal]
+
+    def match_artifacts(
+        self, cases: list[list[tuple[str, str] | str]], include_internal: bool = True
+    ) -> list[dict]:
+        """Find the Questions each case can answer with the data it collected.
+
+        A Question can be answered if any of its Approaches uses any of the
+        collected data (see ArtifactMatcher for details).
+
+        Args:
+            cases (list): For each case, the collected data, as (type, value) pairs
+                like ("ForensicArtifact", "NTFSUSNJournal"). A plain string is
+                taken as the name of a ForensicArtifact.
+            include_internal (bool): Whether to match internal components.
+
+        Returns:
+            For each case, a dict of the answerable Question IDs ("questions") and
+            of (answerable, total) Question counts per Facet ("facets") and per
+            Scenario ("scenarios").
+        """
+        return self.artifact_matcher(include_internal).match_many(cases)
+
+    def descendants(
+        self,
+        dfiq_id: str,
+        component_type: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Returns every component below a component in the DFIQ hierarchy.
+
+        For example, the descendants of a Scenario are all of its Facets, all of
+        their Questions, and all of those Questions' Approaches. This is a lookup
+        in the closures precomputed by build_closures() (the first time they are
+        needed), not a walk of the graph.
+
+        Args:
+            dfiq_id (str): The ID of the component.
+            component_type (str, optional): Only return components of this type (like
+                "approach"). Defaults to all types.
+            include_internal (bool): Whether to include internal components.
+
+        Returns:
+            The descendant components, sorted by ID.
+        """
+        return self._get_related(
+            "descendants", dfiq_id, component_type, include_internal
         )
 
+    def ancestors(
+        self,
+        dfiq_id: str,
+        component_type: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Returns every component above a component in the DFIQ hierarchy.
+
+        For example, the ancestors of an Approach are its Questions, their Facets,
+        and those Facets' Scenarios.
+
+        Args:
+            dfiq_id (str): The ID of the component.
+            component_type (str, optional): Only return components of this type (like
+                "scenario"). Defaults to all types.
+            include_internal (bool): Whether to include internal components.
+
+        Returns:
+            The ancestor components, sorted by ID.
+        """
+        return self._get_related("ancestors", dfiq_id, component_type, include_internal)
+
+    def _get_related(
+        self,
+        direction: str,
+        dfiq_id: str,
+        component_type: str | None,
+        include_internal: bool,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Look up a component's ancestors or descendants (see build_closures())."""
+        if self._descendants is None:
+            self.build_closures()
+        if direction == "descendants":
+            closures = self._descendants
+        else:
+            closures = self._ancestors
+
+        if dfiq_id not in closures:
+            raise KeyError(f"Unknown DFIQ ID {dfiq_id}")
+
+        related = []
+        for related_id in closures[dfiq_id]:
+            component = self.components.get(related_id)
+            # Parent IDs that don't match a loaded component are skipped.
+            if not component:
+                continue
+            if component_type and component.type != component_type:
+                continue
+            if not include_internal and component.is_internal:
+                continue
+            related.append(component)
+        return related
+
+    @property
+    def step_catalog(self) -> StepCatalog:
+        """The index of the steps used by Approaches, built on first use."""
+        if self._step_catalog is None:
+            self._step_catalog = StepCatalog.from_approaches(self.approaches())
+        return self._step_catalog
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """The full-text search index, built on first use (and after reloading).
+
+        It can be saved with `search_index.save(path)` and restored by assigning
+        `SearchIndex.load(path)` to this attribute.
+        """
+        if self._search_index is None:
+            self._search_index = SearchIndex.from_components(self.components.values())
+        return self._search_index
+
+    @search_index.setter
+    def search_index(self, search_index: SearchIndex) -> None:
+        self._search_index = search_index
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 10,
+        component_type: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Full-text search over component names, descriptions, tags, and Approaches.
+
+        Results are ranked with BM25, and the last query term also matches as a
+        prefix (see dfiq.search.SearchIndex).
+
+        Args:
+            query (str): The search terms.
+            limit (int, optional): The maximum number of results to return.
+            component_type (str, optional): Only return components of this type.
+            include_internal (bool): Whether to include internal components.
+
+        Returns:
+            The matching components, best match first.
+        """
+        results = []
+        for dfiq_id, _ in self.search_index.search(
+            query,
+            limit=limit if include_internal else None,
+            component_type=component_type,
+        ):
+            component = self.components.get(dfiq_id)
+            if not component or (component.is_internal and not include_internal):
+                continue
+            results.append(component)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _intersect_sorted(postings: list) -> list:
+        """Intersect sorted lists of IDs or record numbers, shortest first."""
+        if not postings:
+            return []
+        postings = sorted(postings, key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not result:
+                break
+            intersection = []
+            i = j = 0
+            while i < len(result) and j < len(posting):
+                if result[i] == posting[j]:
+                    intersection.append(result[i])
+                    i += 1
+                    j += 1
+                elif result[i] < posting[j]:
+                    i += 1
+                else:
+                    j += 1
+            result = intersection
+        return result
+
+    @staticmethod
+    def _union_sorted(postings: list) -> list:
+        """Merge sorted lists of IDs (or record numbers) into one without duplicates."""
+        union = []
+        for dfiq_id in heapq.merge(*postings):
+            if not union or union[-1] != dfiq_id:
+                union.append(dfiq_id)
+        return union
+
+    def _get_index(
+        self,
+        component_type: str,
+        include_internal: bool = True,
+        with_approaches_only: bool = False,
+    ) -> list:
+        """Returns a prebuilt index of components (see build_indexes())."""
+        if component_type not in self._indexes:
+            self.build_indexes({component_type})
+        return self._indexes[component_type][(include_internal, with_approaches_only)]
+
+    @_timed("child_ids")
     def add_child_ids(self) -> None:
         """Adds the list of their child IDs to a component's `child_ids` attribute.
 
@@ -297,27 +992,134 @@ class DFIQ:
         children in it directly (allowing a "top-down" view of the DFIQ hierarchy), only the component's
         parent(s) are. This enables filtering out "internal" components without leaking references to
         those components. Because of this, DFIQ takes a "bottom-up" approach to construct the hierarchy
-        at the time of initialization (using a networkx DiGraph).
+        at the time of initialization (using a Hierarchy graph).
         """
-        if not self.graph:
+        if self.graph is None:
             raise ValueError("DFIQ Graph needed before adding children.")
 
         for dfiq_id, component in self.components.items():
-            children = sorted(list(nx.DiGraph.successors(self.graph, dfiq_id)))
+            children = sorted(self.graph.successors(dfiq_id))
             self.components[dfiq_id].set_children(children)
 
+    @_timed("closures")
+    def build_closures(self, dfiq_ids: set[str] | None = None) -> None:
+        """Precompute every component's ancestors and descendants.
+
+        Each closure is stored as a sorted tuple of IDs, and equal tuples (like the
+        ancestors of sibling Questions) are shared. This runs automatically the
+        first time descendants() or ancestors() is called, and after reloading.
+
+        Args:
+            dfiq_ids (set[str], optional): Only recompute the closures that could
+                have changed after the edges of these components changed: the
+                descendants of their ancestors, and the ancestors of their
+                descendants. Defaults to recomputing every closure.
+        """
+        if self.graph is None:
+            raise ValueError("DFIQ Graph needed before building closures.")
+
+        if dfiq_ids is None or self._descendants is None:
+            self._descendants = {}
+            self._ancestors = {}
+            stale_descendants = set(self.graph)
+            stale_ancestors = set(self.graph)
+        else:
+            for dfiq_id in dfiq_ids:
+                if dfiq_id not in self.graph:
+                    self._descendants.pop(dfiq_id, None)
+                    self._ancestors.pop(dfiq_id, None)
+            changed_ids = [dfiq_id for dfiq_id in dfiq_ids if dfiq_id in self.graph]
+            stale_descendants = self._walk(changed_ids, self.graph.predecessors)
+            stale_ancestors = self._walk(changed_ids, self.graph.successors)
+            for dfiq_id in stale_descendants:
+                self._descendants.pop(dfiq_id, None)
+            for dfiq_id in stale_ancestors:
+                self._ancestors.pop(dfiq_id, None)
+
+        self._compute_closures(
+            stale_descendants, self.graph.successors, self._descendants
+        )
+        self._compute_closures(
+            stale_ancestors, self.graph.predecessors, self._ancestors
+        )
+
+    @staticmethod
+    def _walk(start_ids: list[str], neighbors: Callable) -> set[str]:
+        """Returns the given nodes and every node reachable from them."""
+        seen = set(start_ids)
+        stack = list(start_ids)
+        while stack:
+            for neighbor in neighbors(stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def _compute_closures(
+        self, dfiq_ids: set[str], neighbors: Callable, closures: dict
+    ) -> None:
+        """Fill in `closures` for the given nodes in one depth-first pass.
+
+        Each node's closure is built from its neighbors' (which are finished
+        first), so every node is visited once. Closures already in `closures` are
+        reused as-is.
+        """
+        found_cycle = False
+        for dfiq_id in dfiq_ids:
+            if dfiq_id in closures:
+                continue
+            stack = [(dfiq_id, neighbors(dfiq_id))]
+            on_stack = {dfiq_id}
+            while stack:
+                node, remaining_neighbors = stack[-1]
+                for neighbor in remaining_neighbors:
+                    if neighbor in on_stack:
+                        found_cycle = True
+                    elif neighbor not in closures:
+                        stack.append((neighbor, neighbors(neighbor)))
+                        on_stack.add(neighbor)
+                        break
+                else:
+                    stack.pop()
+                    on_stack.discard(node)
+                    reachable = set()
+                    for neighbor in neighbors(node):
+                        reachable.add(neighbor)
+                        reachable.update(closures.get(neighbor, ()))
+                    closures[node] = self._share(tuple(sorted(reachable)))
+
+        # Cycles aren't valid in DFIQ, but if there is one, the closures of the
+        # nodes in it are incomplete; fall back to walking the graph for each node.
+        if found_cycle:
+            for dfiq_id in dfiq_ids:
+                closures[dfiq_id] = self._share(
+                    tuple(sorted(self._walk(list(neighbors(dfiq_id)), neighbors)))
+                )
+
+    @_timed("child_tags")
     def add_child_tags(self) -> None:
         """Adds tags from a Question's Approaches to that Question's `all_tags attribute."""
-        if not self.graph:
+        if self.graph is None:
             raise ValueError("DFIQ Graph needed before adding children.")
 
+        # Start from each component's own tags, so this can safely be re-run.
+        for component in self.components.values():
+            component.all_tags = self._share(frozenset(component.tags))
+
+        all_tags = {}
         for dfiq_id, component in self.components.items():
-            parents = sorted(list(nx.DiGraph.predecessors(self.graph, dfiq_id)))
+            parents = sorted(self.graph.predecessors(dfiq_id))
             if self.components[dfiq_id].type == "approach":
                 for parent in parents:
-                    self.components[parent].all_tags = self.components[
-                        parent
-                    ].all_tags.union(self.components[dfiq_id].tags)
+                    # Skip parents that were not loaded (like an invalid Question).
+                    if parent not in self.components:
+                        continue
+                    all_tags.setdefault(
+                        parent, set(self.components[parent].tags)
+                    ).update(self.components[dfiq_id].tags)
+
+        for parent, tags in all_tags.items():
+            self.components[parent].all_tags = self._share(frozenset(tags))
 
     @staticmethod
     def convert_yaml_object_to_dfiq_component(
@@ -332,11 +1134,14 @@ class DFIQ:
             "approach",
         ), "Object must be of known DFIQ type"
 
+        # The DFIQ spec names this field "name"; older files used "display_name".
+        name = yaml_object.get("name", yaml_object.get("display_name"))
+
         if yaml_object["type"] == "scenario":
             return Scenario(
                 yaml_object["id"],
                 yaml_object["uuid"],
-                yaml_object["display_name"],
+                name,
                 yaml_object.get("description"),
                 yaml_object.get("tags"),
             )
@@ -345,7 +1150,7 @@ class DFIQ:
             return Facet(
                 yaml_object["id"],
                 yaml_object["uuid"],
-                yaml_object["display_name"],
+                name,
                 yaml_object.get("description"),
                 yaml_object.get("tags"),
                 yaml_object.get("parent_ids"),
@@ -355,7 +1160,7 @@ class DFIQ:
             return Question(
                 yaml_object["id"],
                 yaml_object["uuid"],
-                yaml_object["display_name"],
+                name,
                 yaml_object.get("description"),
                 yaml_object.get("tags"),
                 yaml_object.get("parent_ids"),
@@ -365,7 +1170,7 @@ class DFIQ:
             return Approach(
                 yaml_object["id"],
                 yaml_object["uuid"],
-                yaml_object["display_name"],
+                name,
                 yaml_object.get("description"),
                 yaml_object.get("tags"),
                 yaml_object.get("view"),
@@ -374,25 +1179,20 @@ class DFIQ:
         else:
             return None
 
-    def load_yaml_files_by_type(
+    def _get_yaml_file_paths(
         self, dfiq_type: str, yaml_data_path: str | None = None
-    ) -> dict:
-        """Load all DFIQ YAML files of a given type from the appropriate path.
-
-        Given the yaml_data_path, locate the correct subdirectory for that
-        dfiq_type, validate any YAML files there, and load them into a dict.
+    ) -> list[str]:
+        """Locate all DFIQ YAML files of a given type.
 
         Args:
             dfiq_type (str): The component type (Scenario, Facet, Question, or Approach).
             yaml_data_path (str, optional): The base path holding the YAML files.
-
         """
-        component_dict = {}
         yaml_file_paths = []
 
         if not yaml_data_path:
-            dfiq_data_files = importlib.resources.files(
-                f"dfiq.data.{self.plural_map.get(dfiq_type)}"
+            dfiq_data_files = self._get_dfiq_file(
+                f"data.{self.plural_map.get(dfiq_type)}"
             )
             for data_file_path in dfiq_data_files.iterdir():
                 # Cast the path from Traversable -> str -> Path; I could not
@@ -412,26 +1212,213 @@ class DFIQ:
                 )
                 yaml_file_paths.append(file_to_open)
 
-        for file_to_open in yaml_file_paths:
-            if not self.validate_yaml_file(file_to_open):
-                continue
+        return yaml_file_paths
 
-            if not self.validate_dfiq_schema(file_to_open, dfiq_type):
-                continue
+    def load_yaml_files_by_type(
+        self, dfiq_type: str, yaml_data_path: str | None = None
+    ) -> dict:
+        """Load all DFIQ YAML files of a given type from the appropriate path.
+
+        Given the yaml_data_path, locate the correct subdirectory for that
+        dfiq_type, validate any YAML files there, and load them into a dict.
+
+        Args:
+            dfiq_type (str): The component type (Scenario, Facet, Question, or Approach).
+            yaml_data_path (str, optional): The base path holding the YAML files.
+
+        """
+        component_dict = {}
+        yaml_file_paths = self._get_yaml_file_paths(dfiq_type, yaml_data_path)
+        yaml_files = [(dfiq_type, file_path) for file_path in yaml_file_paths]
+
+        for converted in self._load_yaml_files(yaml_files):
+            if converted:
+                component_dict[converted.id] = converted
+        return component_dict
+
+    def iter_components(
+        self, yaml_data_path: str | None = None
+    ) -> Iterator[Scenario | Facet | Question | Approach]:
+        """Load DFIQ YAML files one at a time, yielding each valid component.
+
+        Components are yielded in a stable order: Scenarios, Facets, Questions, and
+        then Approaches, each sorted by file name. Only one file is read and parsed
+        at a time, and files that fail parsing or validation are skipped (with a
+        warning, as when loading normally). The components are not added to this
+        instance.
 
-            with open(file_to_open, mode="r") as file:
+        Args:
+            yaml_data_path (str, optional): The base path holding the YAML files.
+                Defaults to this instance's `yaml_data_path`.
+        """
+        for _, _, converted in self._iter_loaded_yaml_files(yaml_data_path):
+            if converted:
+                yield converted
+
+    def _iter_loaded_yaml_files(
+        self, yaml_data_path: str | None = None
+    ) -> Iterator[tuple[str, str, Scenario | Facet | Question | Approach | None]]:
+        """Yield (dfiq_type, yaml_file_path, converted component or None) tuples."""
+        if not yaml_data_path:
+            yaml_data_path = self.yaml_data_path
+
+        for dfiq_type in ["Scenario", "Facet", "Question", "Approach"]:
+            for file_path in sorted(
+                self._get_yaml_file_paths(dfiq_type, yaml_data_path)
+            ):
+                yield dfiq_type, file_path, self._load_yaml_file_by_type(
+                    file_path, dfiq_type
+                )
+
+    def _load_yaml_files(
+        self, yaml_files: list[tuple[str, str]]
+    ) -> list[Scenario | Facet | Question | Approach | None]:
+        """Load a list of (dfiq_type, yaml_file_path) pairs.
+
+        Files are loaded serially, or by a pool of worker processes if `workers` is
+        set. Either way, the returned list holds the converted component (or None,
+        if the file failed parsing or validation) for each input file, in order.
+        """
+        if self.workers and self.workers > 1 and len(yaml_files) > 1:
+            return self._load_yaml_files_in_parallel(yaml_files)
+
+        return [
+            self._load_yaml_file_by_type(file_path, dfiq_type)
+            for dfiq_type, file_path in yaml_files
+        ]
+
+    def _load_yaml_file_by_type(
+        self, yaml_file_path: str, dfiq_type: str
+    ) -> Scenario | Facet | Question | Approach | None:
+        """Load a single DFIQ YAML file, honoring the `single_parse` setting."""
+        start_time = time.perf_counter()
+        if self.single_parse:
+            converted = self.load_yaml_file(
+                yaml_file_path, self._get_schema(dfiq_type), self.stats
+            )
+        else:
+            converted = self._load_yaml_file_legacy(
+                yaml_file_path, self._get_schema(dfiq_type), self.stats
+            )
+        self.stats.add_file_time(yaml_file_path, time.perf_counter() - start_time)
+        return converted
+
+    @staticmethod
+    def _load_yaml_file_legacy(
+        yaml_file_path: str, schema: yamale.schema.Schema, stats: LoadStats
+    ) -> Scenario | Facet | Question | Approach | None:
+        """Load a single DFIQ YAML file, parsing it separately for each step."""
+        import yamale
+
+        stats.count("files_read")
+        with stats.phase("parse"):
+            parsed = DFIQ.validate_yaml_file(yaml_file_path)
+        if not parsed:
+            stats.count("parse_failures")
+            return None
+
+        with stats.phase("validate"):
+            try:
+                yamale.validate(schema, yamale.make_data(yaml_file_path))
+                valid = True
+            except yamale.YamaleError as e:
+                logging.warning(e)
+                valid = False
+        if not valid:
+            stats.count("validation_failures")
+            return None
+
+        import yaml
+
+        with stats.phase("convert"):
+            with open(yaml_file_path, mode="r") as file:
                 component_from_yaml = yaml.safe_load(file)
-                converted = self.convert_yaml_object_to_dfiq_component(
+                converted = DFIQ.convert_yaml_object_to_dfiq_component(
                     component_from_yaml
                 )
+        stats.count("components_loaded")
+        return converted
 
-                if converted:
-                    component_dict[component_from_yaml["id"]] = converted
-        return component_dict
+    @staticmethod
+    def load_yaml_file(
+        yaml_file_path: str,
+        schema: yamale.schema.Schema,
+        stats: LoadStats | None = None,
+    ) -> Scenario | Facet | Question | Approach | None:
+        """Read, parse, validate, and convert a single DFIQ YAML file.
+
+        The file is read from disk and parsed only once (using the C-accelerated
+        YAML loader when available). The same parsed object is then used for
+        both schema validation and conversion to a dfiq.Component.
+
+        Args:
+            yaml_file_path (str): The path of the YAML file to load.
+            schema (yamale.schema.Schema): The compiled schema for the file's component type.
+            stats (LoadStats, optional): Where to record the time spent in each step.
+
+        Returns:
+            The converted component, or None if the file failed parsing or validation.
+        """
+        if stats is None:
+            stats = LoadStats()
+
+        with stats.phase("read"):
+            with open(yaml_file_path, mode="rb") as file:
+                raw_yaml = file.read()
+        stats.count("files_read")
+        stats.count("bytes_read", len(raw_yaml))
+
+        return DFIQ.load_yaml_data(raw_yaml, yaml_file_path, schema, stats)
+
+    @staticmethod
+    def load_yaml_data(
+        raw_yaml: bytes,
+        yaml_file_path: str,
+        schema: yamale.schema.Schema,
+        stats: LoadStats | None = None,
+    ) -> Scenario | Facet | Question | Approach | None:
+        """Parse, validate, and convert the contents of a DFIQ YAML file.
+
+        Args:
+            raw_yaml (bytes): The contents of the YAML file.
+            yaml_file_path (str): The path the contents were read from (used in messages).
+            schema (yamale.schema.Schema): The compiled schema for the file's component type.
+            stats (LoadStats, optional): Where to record the time spent in each step.
+
+        Returns:
+            The converted component, or None if the data failed parsing or validation.
+        """
+        import yaml
+
+        if stats is None:
+            stats = LoadStats()
+
+        try:
+            with stats.phase("parse"):
+                component_from_yaml = yaml.load(raw_yaml, Loader=_get_yaml_loader())
+        except (yaml.parser.ParserError, yaml.scanner.ScannerError) as e:
+            logging.warning(f"error parsing {yaml_file_path}:\n{e}")
+            stats.count("parse_failures")
+            return None
+
+        with stats.phase("validate"):
+            valid = DFIQ.validate_dfiq_object(
+                component_from_yaml, schema, yaml_file_path
+            )
+        if not valid:
+            stats.count("validation_failures")
+            return None
+
+        with stats.phase("convert"):
+            converted = DFIQ.convert_yaml_object_to_dfiq_component(component_from_yaml)
+        stats.count("components_loaded")
+        return converted
 
     @staticmethod
     def validate_yaml_file(yaml_file_path: str) -> bool:
         """Validate that a YAML file can be parsed by pyYAML."""
+        import yaml
+
         with open(yaml_file_path, mode="r") as file:
             try:
                 _ = yaml.safe_load(file)
@@ -443,35 +1430,57 @@ class DFIQ:
     @staticmethod
     def _get_dfiq_file(subdirectory, file_name=None):
         """Load a file bundled in the dfiq package. If multiple subdirectories are needed, use . to separate them."""
+        import importlib.resources
+
         if file_name:
             return importlib.resources.files(f"dfiq.{subdirectory}").joinpath(file_name)
         else:
             return importlib.resources.files(f"dfiq.{subdirectory}")
 
     def _get_dfiq_directory(self, subdirectory):
+        import importlib.resources
+
         return importlib.resources.as_file(self._get_dfiq_file(subdirectory))
 
     def _load_dfiq_schema(self) -> None:
         """Load Yamale 'spec' files to use for validation."""
+        for dfiq_type in self.schemas:
+            self._get_schema(dfiq_type)
 
-        self.schemas["Scenario"] = yamale.make_schema(
-            self._get_dfiq_file("utils", "scenario_spec.yaml")
-        )
-        self.schemas["Facet"] = yamale.make_schema(
-            self._get_dfiq_file("utils", "facet_spec.yaml")
-        )
-        self.schemas["Question"] = yamale.make_schema(
-            self._get_dfiq_file("utils", "question_spec.yaml")
-        )
-        self.schemas["Approach"] = yamale.make_schema(
-            self._get_dfiq_file("utils", "approach_spec.yaml")
-        )
+    def _get_schema(self, dfiq_type: str) -> yamale.schema.Schema:
+        """Returns the compiled schema for a component type, compiling it if needed."""
+        if self.schemas[dfiq_type] is None:
+            import yamale
+
+            self.schemas[dfiq_type] = yamale.make_schema(
+                self._get_dfiq_file("utils", f"{dfiq_type.lower()}_spec.yaml")
+            )
+        return self.schemas[dfiq_type]
 
     def validate_dfiq_schema(self, yaml_file_path: str, component_type: str) -> bool:
         """Validate that a YAML file adheres to the appropriate DFIQ Schema."""
+        import yamale
+
         try:
             yaml_to_validate = yamale.make_data(yaml_file_path)
-            yamale.validate(self.schemas[component_type], yaml_to_validate)
+            yamale.validate(self._get_schema(component_type), yaml_to_validate)
+        except yamale.YamaleError as e:
+            logging.warning(e)
+            return False
+        return True
+
+    @staticmethod
+    def validate_dfiq_object(
+        yaml_object: dict | None, schema: yamale.schema.Schema, yaml_file_path: str
+    ) -> bool:
+        """Validate that an already-parsed YAML object adheres to the appropriate DFIQ Schema."""
+        import yamale
+
+        # Mirror yamale.make_data(), which returns an empty dict for empty files.
+        if yaml_object is None:
+            yaml_object = {}
+        try:
+            yamale.validate(schema, [(yaml_object, yaml_file_path)])
         except yamale.YamaleError as e:
             logging.warning(e)
             return False
@@ -482,28 +1491,600 @@ class DFIQ:
         if not yaml_data_path:
             yaml_data_path = self.yaml_data_path
 
-        self.components = {}
+        yaml_files = []
         for dfiq_component in ["Scenario", "Facet", "Question", "Approach"]:
-            self.components.update(
-                self.load_yaml_files_by_type(dfiq_component, yaml_data_path)
+            for file_path in self._get_yaml_file_paths(dfiq_component, yaml_data_path):
+                yaml_files.append((dfiq_component, file_path))
+
+        self.components = {}
+        self._source_files = {}
+        for (dfiq_type, file_path), converted in zip(
+            yaml_files, self._load_yaml_files(yaml_files)
+        ):
+            stat = os.stat(file_path)
+            self._source_files[os.path.abspath(file_path)] = (
+                dfiq_type,
+                stat.st_mtime_ns,
+                stat.st_size,
+                None,
+                converted,
             )
+            if converted:
+                self.components[converted.id] = converted
 
-    def build_graph(self) -> None:
-        """Create a nx.DiGraph linking all loaded DFIQ components."""
-        self.graph = nx.DiGraph()
-        for dfiq_id, content in self.components.items():
-            self.graph.add_node(dfiq_id)
-            logging.debug(f"added node: {dfiq_id}")
+    def load_dfiq_items_from_stream(self, yaml_data_path: str | None = None) -> None:
+        """Load all four types of DFIQ components, building the graph as they load.
+
+        This gives the same `components` and `graph` as load_dfiq_items_from_yaml()
+        followed by build_graph(), but files are loaded serially with
+        iter_components()'s order and each component is linked into the graph as
+        soon as it is loaded. No list of all the loaded files is built along the
+        way, so peak memory stays close to that of the components themselves.
+        """
+        self.components = {}
+        self._source_files = {}
+        self.graph = Hierarchy()
+        for dfiq_type, file_path, converted in self._iter_loaded_yaml_files(
+            yaml_data_path
+        ):
+            stat = os.stat(file_path)
+            self._source_files[os.path.abspath(file_path)] = (
+                dfiq_type,
+                stat.st_mtime_ns,
+                stat.st_size,
+                None,
+                converted,
+            )
+            if converted:
+                # As in load_dfiq_items_from_yaml(), a later file with the same ID
+                # replaces the earlier one.
+                if converted.id in self.components:
+                    self._remove_component(converted.id, set())
+                self._add_component(converted, set())
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: Path | str, **kwargs) -> DFIQ:
+        """Create a DFIQ instance from a snapshot written by export().
+
+        Loading a snapshot doesn't need PyYAML or Yamale, as the components in it
+        were already validated when they were exported.
+
+        Args:
+            snapshot_path (Path | str): The snapshot file, in any export() format.
+            **kwargs: Other arguments for DFIQ() (like `markdown_output_path`).
+        """
+        return cls(snapshot_path=snapshot_path, **kwargs)
+
+    @_timed("snapshot_read")
+    def load_dfiq_items_from_snapshot(
+        self, snapshot_path: Path | str | None = None
+    ) -> None:
+        """Load all DFIQ components from a snapshot written by export()."""
+        if not snapshot_path:
+            snapshot_path = self.snapshot_path
+
+        from . import snapshot
+
+        self.components = {}
+        self._source_files = {}
+        for record in snapshot.read_snapshot(snapshot_path):
+            converted = self.convert_yaml_object_to_dfiq_component(record)
+            self.components[converted.id] = converted
+        self.stats.count("components_loaded", len(self.components))
+        logging.info(
+            f"Loaded {len(self.components)} DFIQ components from {snapshot_path}"
+        )
+
+    def export(
+        self, path: Path | str, format: str = "jsonl", include_internal: bool = True
+    ) -> None:
+        """Export all DFIQ components to a single snapshot file.
+
+        The snapshot can be loaded again with from_snapshot(), much faster than
+        loading the YAML files.
+
+        Args:
+            path (Path | str): The file to write. It is replaced atomically.
+            format (str): "jsonl" for JSON Lines (one component per line), "sqlite"
+                for a SQLite database with tables of components, tags, edges, and
+                Approach analysis steps, or "mapped" for a binary snapshot that
+                MappedDFIQ queries in place (which can't be loaded with
+                from_snapshot()).
+            include_internal (bool): Whether to include internal components.
+        """
+        components = []
+        for component_type in ["scenario", "facet", "question", "approach"]:
+            components.extend(self._get_index(component_type, include_internal))
+        if format == "mapped":
+            from .mapped import write_mapped_snapshot
+
+            write_mapped_snapshot(components, path)
+        else:
+            from . import snapshot
+
+            snapshot.write_snapshot(components, path, format)
+        logging.info(f"Exported {len(components)} DFIQ components to {path}")
+
+    def _load_yaml_files_in_parallel(
+        self, yaml_files: list[tuple[str, str]]
+    ) -> list[Scenario | Facet | Question | Approach | None]:
+        """Load (dfiq_type, yaml_file_path) pairs using a pool of worker processes.
+
+        The files are split into chunks of a single component type, which are parsed
+        and validated in the workers. Loaded components and any warnings logged while
+        loading them are merged back in file order, so the result (and the log output)
+        matches what the serial loader produces. The workers' `stats` are merged too.
+        """
+        files_by_type = {}
+        for dfiq_type, file_path in yaml_files:
+            files_by_type.setdefault(dfiq_type, []).append(file_path)
+
+        # Use a few chunks per worker so uneven file sizes balance out.
+        chunk_size = max(1, math.ceil(len(yaml_files) / (self.workers * 4)))
+        chunks = []
+        for dfiq_type, file_paths in files_by_type.items():
+            for i in range(0, len(file_paths), chunk_size):
+                chunks.append(
+                    (
+                        dfiq_type,
+                        file_paths[i : i + chunk_size],
+                        self.stats.file_timings is not None,
+                        self.single_parse,
+                    )
+                )
+
+        import concurrent.futures
+
+        schemas = {
+            dfiq_type: self._get_schema(dfiq_type) for dfiq_type in files_by_type
+        }
+        loaded_by_path = {}
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_load_worker,
+            initargs=(schemas,),
+        ) as executor:
+            for (_, file_paths, _, _), (loaded, log_records, stats) in zip(
+                chunks, executor.map(_load_yaml_files_chunk, chunks)
+            ):
+                for level, message in log_records:
+                    logging.log(level, message)
+                loaded_by_path.update(zip(file_paths, loaded))
+                self.stats.merge(stats)
+
+        return [loaded_by_path[file_path] for _, file_path in yaml_files]
+
+    def load_dfiq_items_with_cache(self) -> None:
+        """Load all DFIQ components and build the graph, reusing the on-disk cache.
+
+        If no YAML file changed since the cache was written, the cached components
+        and graph are used as-is. Otherwise, only new or changed files are loaded
+        again, and the graph, child IDs, and tags are rebuilt before the cache is
+        updated. Files that failed validation are cached too, so they are only
+        loaded again once they change.
+        """
+        cache_path = self._get_cache_path()
+        schema_digest = self._get_schema_digest()
+        with self.stats.phase("cache_read"):
+            cached = self._read_cache(cache_path, schema_digest)
+        cached_files = cached["files"] if cached else {}
+
+        # Keyed and laid out like self._source_files.
+        files = {}
+        yaml_files_to_load = []
+        for dfiq_type in ["Scenario", "Facet", "Question", "Approach"]:
+            for file_path in self._get_yaml_file_paths(dfiq_type, self.yaml_data_path):
+                stat = os.stat(file_path)
+                source_path = os.path.abspath(file_path)
+                entry = cached_files.get(source_path)
+                if (
+                    entry
+                    and entry[0] == dfiq_type
+                    and entry[1:3] == (stat.st_mtime_ns, stat.st_size)
+                ):
+                    files[source_path] = entry
+                    continue
 
+                with open(file_path, mode="rb") as file:
+                    digest = hashlib.sha256(file.read()).hexdigest()
+                if entry and entry[0] == dfiq_type and entry[3] == digest:
+                    files[source_path] = (
+                        dfiq_type,
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                        digest,
+                        entry[4],
+                    )
+                    continue
+
+                files[source_path] = (
+                    dfiq_type,
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    digest,
+                    None,
+                )
+                yaml_files_to_load.append((dfiq_type, file_path))
+
+        self.stats.count("cache_hits", len(files) - len(yaml_files_to_load))
+        if cached and not yaml_files_to_load and files.keys() == cached_files.keys():
+            logging.info(f"Loaded DFIQ components from cache {cache_path}")
+            for source_path, entry in files.items():
+                if not entry[4]:
+                    logging.warning(f"Skipped {source_path}; it failed validation")
+            self.components = cached["components"]
+            self.graph = cached["graph"]
+            self._source_files = files
+            # Only touched files (with new mtimes but the same contents) need the
+            # cache to be rewritten, so they aren't hashed again on the next load.
+            if files != cached_files:
+                cached["files"] = files
+                with self.stats.phase("cache_write"):
+                    self._write_cache(cache_path, cached)
+            return
+
+        logging.info(
+            f"Loading {len(yaml_files_to_load)} of {len(files)} DFIQ YAML files not in "
+            f"cache {cache_path}"
+        )
+        loaded = self._load_yaml_files(yaml_files_to_load)
+        for (_, file_path), converted in zip(yaml_files_to_load, loaded):
+            source_path = os.path.abspath(file_path)
+            files[source_path] = files[source_path][:4] + (converted,)
+
+        self._source_files = files
+        self.components = {}
+        for entry in files.values():
+            component = entry[4]
+            if component:
+                self.components[component.id] = component
+
+        self.build_graph()
+        self.add_child_ids()
+        self.add_child_tags()
+        with self.stats.phase("cache_write"):
+            self._write_cache(
+                cache_path,
+                {
+                    "version": CACHE_FORMAT_VERSION,
+                    "schema_digest": schema_digest,
+                    "files": files,
+                    "components": self.components,
+                    "graph": self.graph,
+                },
+            )
+
+    def _get_cache_path(self) -> Path:
+        """Returns the cache file path for this instance's YAML data path."""
+        if self.yaml_data_path:
+            data_path = str(Path(self.yaml_data_path).resolve())
+        else:
+            data_path = str(self._get_dfiq_file("data"))
+        data_path_digest = hashlib.sha256(data_path.encode("utf-8")).hexdigest()
+        return Path(self.cache_dir, f"dfiq-{data_path_digest[:16]}.pickle")
+
+    def _get_schema_digest(self) -> str:
+        """Returns a digest of the Yamale 'spec' files used for validation."""
+        digest = hashlib.sha256()
+        for spec_file_name in [
+            "scenario_spec.yaml",
+            "facet_spec.yaml",
+            "question_spec.yaml",
+            "approach_spec.yaml",
+        ]:
+            digest.update(self._get_dfiq_file("utils", spec_file_name).read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_cache(cache_path: Path, schema_digest: str) -> dict | None:
+        """Read a corpus cache file, returning None if it is missing or stale."""
+        try:
+            with open(cache_path, mode="rb") as file:
+                cached = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # A corrupt cache is never fatal; just rebuild it.
+            logging.warning(f"Ignoring unreadable DFIQ cache {cache_path}: {e}")
+            return None
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("version") != CACHE_FORMAT_VERSION
+            or cached.get("schema_digest") != schema_digest
+        ):
+            logging.info(f"Ignoring stale DFIQ cache {cache_path}")
+            return None
+        return cached
+
+    @staticmethod
+    def _write_cache(cache_path: Path, cache_contents: dict) -> None:
+        """Atomically write a corpus cache file."""
+        cache_path.parent.mkdir(exist_ok=True, parents=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, mode="wb") as file:
+            pickle.dump(cache_contents, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        logging.info(f"Wrote DFIQ cache to {cache_path}")
+
+    @_timed("reload")
+    def reload(self, paths: list[Path | str]) -> list[str]:
+        """Reload the given DFIQ YAML files, updating the knowledge base in place.
+
+        Only the given files are parsed again. Their components are replaced (or
+        removed, if the file was deleted or no longer validates) in `components`,
+        their edges in `graph` are patched, and `child_ids` and `all_tags` are
+        recomputed only for the components whose children changed (as are the
+        ancestor and descendant closures that include them).
+
+        Args:
+            paths (list[Path | str]): The added, changed, or deleted YAML files. Each
+                must be in the subdirectory for its component type (like "questions").
+
+        Returns:
+            A sorted list of the IDs of all components that were added, changed,
+            removed, or had their children updated.
+        """
+        if self.graph is None:
+            raise ValueError("DFIQ Graph needed before reloading.")
+
+        affected_ids = set()
+        removed_types = set()
+        self.stats.count("files_reloaded", len(paths))
+        for path in paths:
+            source_path = os.path.abspath(path)
+            old_entry = self._source_files.pop(source_path, None)
+            if old_entry:
+                dfiq_type = old_entry[0]
+            else:
+                dfiq_type = self._get_dfiq_type_for_path(source_path)
+
+            old_component = old_entry[4] if old_entry else None
+            if old_component and self.components.get(old_component.id) is old_component:
+                self._remove_component(old_component.id, affected_ids)
+                removed_types.add(old_component.type)
+
+            if not os.path.exists(source_path):
+                logging.info(f"Removed {dfiq_type} loaded from {source_path}")
+                continue
+
+            stat = os.stat(source_path)
+            converted = self._load_yaml_file_by_type(source_path, dfiq_type)
+            self._source_files[source_path] = (
+                dfiq_type,
+                stat.st_mtime_ns,
+                stat.st_size,
+                None,
+                converted,
+            )
+            if converted:
+                if converted.id in self.components:
+                    self._remove_component(converted.id, affected_ids)
+                self._add_component(converted, affected_ids)
+                logging.info(f"Reloaded {dfiq_type} {converted.id} from {source_path}")
+
+        affected_types = set()
+        for dfiq_id in affected_ids:
+            self._fingerprints.pop(dfiq_id, None)
+            if self._content_hashes is not None:
+                if dfiq_id in self.components:
+                    self._content_hashes[dfiq_id] = get_content_hash(
+                        self.components[dfiq_id]
+                    )
+                else:
+                    self._content_hashes.pop(dfiq_id, None)
+            if dfiq_id in self.components:
+                self._update_child_ids_and_tags(dfiq_id)
+                affected_types.add(self.components[dfiq_id].type)
+        affected_types.update(removed_types)
+        self.build_indexes(affected_types)
+        if self._descendants is not None:
+            self.build_closures(affected_ids)
+        self._artifact_matchers = {}
+        self._search_index = None
+        self._view_models = {}
+        if len(self._shared_values) > 2 * self._shared_values_pruned_size:
+            self._prune_shared_values()
+
+        return sorted(affected_ids)
+
+    def diff(self, other: DFIQ) -> DFIQDiff:
+        """Returns the changes from this version of a DFIQ corpus to another.
+
+        Each component's content (everything but its derived `child_ids` and
+        `all_tags`) is hashed once per instance and kept up to date by `reload()`,
+        so diffing one instance against many others doesn't hash it again.
+        Components are matched by ID, and an added and a removed component with
+        the same UUID are reported as renumbered. Only components whose hashes
+        differ are compared field by field, and the hierarchy's edges are diffed
+        from their parent IDs, so the work done grows with the size of the change.
+
+        Args:
+            other (DFIQ): The newer version of the corpus.
+
+        Returns:
+            A DFIQDiff with the added, removed, renumbered and changed components,
+            and the (parent ID, child ID) edges added and removed.
+        """
+        return diff_components(
+            self.components,
+            self._get_content_hashes(),
+            other.components,
+            other._get_content_hashes(),
+        )
+
+    def _get_content_hashes(self) -> dict[str, bytes]:
+        """Returns a hash of each component's own content, by component ID."""
+        if self._content_hashes is None:
+            self._content_hashes = {
+                dfiq_id: get_content_hash(component)
+                for dfiq_id, component in self.components.items()
+            }
+        return self._content_hashes
+
+    def scan_for_changes(self) -> list[str]:
+        """Returns the YAML files that were added, changed, or deleted since loading."""
+        changed_paths = []
+        seen_paths = set()
+        for dfiq_type in ["Scenario", "Facet", "Question", "Approach"]:
+            for file_path in self._get_yaml_file_paths(dfiq_type, self.yaml_data_path):
+                source_path = os.path.abspath(file_path)
+                seen_paths.add(source_path)
+                entry = self._source_files.get(source_path)
+                stat = os.stat(source_path)
+                if not entry or entry[1:3] != (stat.st_mtime_ns, stat.st_size):
+                    changed_paths.append(source_path)
+
+        changed_paths.extend(
+            source_path
+            for source_path in self._source_files
+            if source_path not in seen_paths
+        )
+        return changed_paths
+
+    def watch(
+        self,
+        interval: float = 1.0,
+        stop_event: threading.Event | None = None,
+        callback: Callable[[list[str]], None] | None = None,
+    ) -> None:
+        """Watch the YAML data path and reload files as they change.
+
+        This polls the YAML files' modification times and sizes every `interval`
+        seconds and calls `reload()` with any that changed. It blocks until
+        `stop_event` is set, so it is usually run in a separate thread.
+
+        Args:
+            interval (float): The number of seconds to wait between checks.
+            stop_event (threading.Event, optional): Set this to stop watching.
+            callback (Callable, optional): Called with the list of component IDs
+                returned by `reload()` after each reload.
+        """
+        if not stop_event:
+            stop_event = threading.Event()
+
+        while not stop_event.wait(interval):
+            changed_paths = self.scan_for_changes()
+            if not changed_paths:
+                continue
+
+            affected_ids = self.reload(changed_paths)
+            if callback:
+                callback(affected_ids)
+
+    def _get_dfiq_type_for_path(self, yaml_file_path: str) -> str:
+        """Returns the DFIQ component type for a YAML file, based on its directory."""
+        directory_name = os.path.basename(os.path.dirname(yaml_file_path))
+        for dfiq_type, plural in self.plural_map.items():
+            if plural == directory_name:
+                return dfiq_type
+        raise ValueError(f"Unable to determine DFIQ type of {yaml_file_path}")
+
+    def _add_component(
+        self, component: Scenario | Facet | Question | Approach, affected_ids: set
+    ) -> None:
+        """Add a component and its parent edges to `components` and `graph`."""
+        self._share_component_values(component)
+        self.components[component.id] = component
+        self.graph.add_node(component.id)
+        for parent_id in component.parent_ids:
+            self.graph.add_edge(parent_id, component.id)
+            affected_ids.add(parent_id)
+        affected_ids.add(component.id)
+        self.stats.count("edges_added", len(component.parent_ids))
+
+    def _remove_component(self, dfiq_id: str, affected_ids: set) -> None:
+        """Remove a component and its parent edges from `components` and `graph`.
+
+        The node itself is kept in the graph if other components still list it as
+        a parent, matching what `build_graph()` does for unknown parent IDs.
+        """
+        component = self.components.pop(dfiq_id)
+        for parent_id in component.parent_ids:
+            if self.graph.has_edge(parent_id, dfiq_id):
+                self.graph.remove_edge(parent_id, dfiq_id)
+            if parent_id not in self.components and not any(
+                True for _ in self.graph.successors(parent_id)
+            ):
+                self.graph.remove_node(parent_id)
+            affected_ids.add(parent_id)
+
+        if not any(True for _ in self.graph.successors(dfiq_id)):
+            self.graph.remove_node(dfiq_id)
+        affected_ids.add(dfiq_id)
+
+    def _update_child_ids_and_tags(self, dfiq_id: str) -> None:
+        """Recompute `child_ids` and `all_tags` for a single component.
+
+        This gives the same result as `add_child_ids()` and `add_child_tags()`, but
+        only for the one component.
+        """
+        component = self.components[dfiq_id]
+        component.set_children(sorted(self.graph.successors(dfiq_id)))
+        all_tags = set(component.tags)
+        for child_id in component.child_ids:
+            child = self.components.get(child_id)
+            if child and child.type == "approach":
+                all_tags.update(child.tags)
+        component.all_tags = self._share(frozenset(all_tags))
+
+    @_timed("graph")
+    def build_graph(self) -> None:
+        """Create a Hierarchy graph linking all loaded DFIQ components."""
+        self.graph = Hierarchy()
+        self.graph.add_nodes_from(self.components)
         for dfiq_id, content in self.components.items():
-            if content.parent_ids:
-                for parent_id in content.parent_ids:
-                    self.graph.add_edge(parent_id, dfiq_id)
-                    logging.debug(f"added edge: {parent_id} -> {dfiq_id}")
+            for parent_id in content.parent_ids:
+                self.graph.add_edge(parent_id, dfiq_id)
+        self.stats.count("edges_added", self.graph.number_of_edges())
+        logging.debug(
+            f"Built DFIQ graph with {len(self.graph)} nodes and "
+            f"{self.graph.number_of_edges()} edges"
+        )
 
     def display_graph(self) -> None:
-        """Display the DFIQ graph."""
-        nx.draw(self.graph, with_labels=True, font_weight="bold")
+        """Display the DFIQ graph (requires networkx and matplotlib)."""
+        graph = self.graph.to_networkx()
+        import networkx as nx
+
+        nx.draw(graph, with_labels=True, font_weight="bold")
+
+    def get_view_model(
+        self, dfiq_id: str
+    ) -> ScenarioViewModel | FacetViewModel | QuestionViewModel | ApproachViewModel:
+        """Returns the values shown on the site for a component.
+
+        View models are built once per component (along with those of its children)
+        and shared by every page that shows it, on both the public and internal
+        sites, so templates don't recompute them.
+
+        Args:
+            dfiq_id (str): The ID of the component.
+
+        Returns:
+            The component's view model, of the class for its type.
+        """
+        view_model = self._view_models.get(dfiq_id)
+        if view_model:
+            return view_model
+
+        component = self.components[dfiq_id]
+        if component.type == "scenario":
+            facets = [self.get_view_model(facet_id) for facet_id in component.facets]
+            view_model = ScenarioViewModel(component, facets)
+        elif component.type == "facet":
+            questions = [
+                self.get_view_model(question_id) for question_id in component.questions
+            ]
+            view_model = FacetViewModel(component, questions)
+        elif component.type == "question":
+            approaches = [
+                self.get_view_model(approach_id) for approach_id in component.approaches
+            ]
+            view_model = QuestionViewModel(component, approaches)
+        else:
+            view_model = ApproachViewModel(component)
+        self._view_models[dfiq_id] = view_model
+        return view_model
 
     def generate_scenario_md(
         self, scenario_id: str, allow_internal: bool = False
@@ -528,18 +2109,29 @@ class DFIQ:
             )
             return
 
+        output_path = self._get_page_output_path("scenario", scenario_id)
+        input_ids = [scenario_id]
+        for facet_id in scenario.facets:
+            input_ids.append(facet_id)
+            input_ids.extend(self.components[facet_id].questions)
+        page_digest = self._get_page_digest(
+            "scenario.jinja2", allow_internal, input_ids
+        )
+        if self._is_page_current(output_path, page_digest):
+            return
+
         template = self.jinja_env.get_template("scenario.jinja2")
+        scenario = self.get_view_model(scenario_id)
+        assert isinstance(scenario, ScenarioViewModel)
         context = {
             "scenario": scenario,
-            "components": self.components,
+            "facets": scenario.get_facets(allow_internal),
             "allow_internal": allow_internal,
         }
 
         content = template.render(context)
-        output_path = Path(self.markdown_output_path, "scenarios", f"{scenario_id}.md")
-        output_file = Path(output_path)
-        output_file.parent.mkdir(exist_ok=True, parents=True)
-        output_file.write_text(content, encoding="utf-8")
+        self.write_content_to_file(content, output_path)
+        self._record_page(output_path, page_digest)
 
     def generate_question_md(
         self,
@@ -575,25 +2167,402 @@ class DFIQ:
             )
             return
 
+        output_path = self._get_page_output_path("question", question_id)
+        page_digest = self._get_page_digest(
+            "question_with_approaches.jinja2",
+            allow_internal,
+            [question_id] + question.approaches,
+        )
+        if self._is_page_current(output_path, page_digest):
+            return
+
         template = self.jinja_env.get_template("question_with_approaches.jinja2")
+        question = self.get_view_model(question_id)
+        assert isinstance(question, QuestionViewModel)
         context = {
             "question": question,
-            "components": self.components,
+            "approaches": question.get_approaches(allow_internal),
             "allow_internal": allow_internal,
         }
 
         content = template.render(context)
-        output_path = Path(self.markdown_output_path, "questions", f"{question_id}.md")
         self.write_content_to_file(content, output_path)
+        self._record_page(output_path, page_digest)
         logging.info(
             f"Wrote Markdown for Question {question_id} to {output_path.resolve()}"
         )
 
     @staticmethod
-    def write_content_to_file(content: str, file_path: Path) -> None:
+    def write_content_to_file(content: str, file_path: Path) -> bool:
+        """Write content to a file, unless the file already has that exact content.
+
+        Leaving unchanged files alone keeps their modification times, so tools like
+        mkdocs do not rebuild pages that did not change.
+
+        Returns:
+            True if the file was written, False if it was already up to date.
+        """
         output_file = Path(file_path)
+        encoded_content = content.encode("utf-8")
+        try:
+            if output_file.read_bytes() == encoded_content:
+                return False
+        except FileNotFoundError:
+            pass
         output_file.parent.mkdir(exist_ok=True, parents=True)
-        output_file.write_text(content, encoding="utf-8")
+        output_file.write_bytes(encoded_content)
+        return True
+
+    def generate_site(
+        self,
+        allow_internal: bool = False,
+        incremental: bool = True,
+        workers: int | None = None,
+        shared_output_path: Path | str | None = None,
+    ) -> dict[str, float]:
+        """Generates all Markdown pages for the DFIQ site.
+
+        This generates the Scenario and Question pages, the Question index, and the
+        Approach glossary. When `incremental` is set, a manifest of the hashed inputs
+        of each page is kept in markdown_output_path, and pages whose inputs (the
+        components shown on them, the template, and `allow_internal`) did not change
+        since the last run are not rendered again.
+
+        With `workers`, pages are rendered concurrently by a pool of worker processes.
+        Each worker gets its own Jinja environment and a read-only copy of this
+        knowledge base (shared copy-on-write where processes are forked), and runs
+        the same generate_*_md methods, so the output is identical to a serial run.
+
+        Args:
+            allow_internal (bool): Check if generating internal items is allowed.
+            incremental (bool): Whether to skip pages whose inputs are unchanged.
+            workers (int, optional): The number of worker processes used to render
+                pages. If not set (or 1), pages are rendered serially.
+            shared_output_path (Path | str, optional): The output path of a site
+                just generated with the other `allow_internal` setting. Pages that
+                are the same in both sites (see _is_page_shared()) are copied from
+                it instead of being rendered again.
+
+        Returns:
+            A dict mapping each page (relative to markdown_output_path) to the number
+            of seconds spent generating it.
+        """
+        if not self.markdown_output_path:
+            raise ValueError("Markdown output path not specified")
+
+        manifest_path = Path(self.markdown_output_path, ".dfiq-manifest.json")
+        self.site_manifest = None
+        if incremental:
+            self.site_manifest = self._read_site_manifest(manifest_path)
+
+        pages = [("scenario", scenario.id) for scenario in self.scenarios()]
+        pages.extend(("question", question.id) for question in self.questions())
+        pages.append(("index", None))
+        pages.append(("glossary", None))
+
+        shared_pages = []
+        if shared_output_path:
+            rendered_pages = []
+            for page in pages:
+                if self._is_page_shared(*page):
+                    shared_pages.append(page)
+                else:
+                    rendered_pages.append(page)
+            pages = rendered_pages
+
+        if workers and workers > 1:
+            page_timings = self._generate_pages_in_parallel(
+                pages, allow_internal, workers
+            )
+        else:
+            page_timings = {}
+            for page_type, page_id in pages:
+                start_time = time.perf_counter()
+                self._generate_page(page_type, page_id, allow_internal)
+                page_key = self._get_page_key(page_type, page_id)
+                page_timings[page_key] = time.perf_counter() - start_time
+
+        for page_type, page_id in shared_pages:
+            start_time = time.perf_counter()
+            page_key = self._get_page_key(page_type, page_id)
+            content = Path(shared_output_path, page_key).read_text(encoding="utf-8")
+            self.write_content_to_file(
+                content, self._get_page_output_path(page_type, page_id)
+            )
+            # The page's manifest entry (if any) was for a rendered version of it,
+            # which it no longer is, so it must be rendered when next not shared.
+            if self.site_manifest is not None:
+                self.site_manifest.pop(page_key, None)
+            page_timings[page_key] = time.perf_counter() - start_time
+
+        if self.site_manifest is not None:
+            self.write_content_to_file(
+                json.dumps(
+                    {"version": SITE_MANIFEST_VERSION, "pages": self.site_manifest},
+                    indent=2,
+                    sort_keys=True,
+                ),
+                manifest_path,
+            )
+
+        return page_timings
+
+    def generate_sites(
+        self,
+        public_output_path: Path | str,
+        internal_output_path: Path | str,
+        incremental: bool = True,
+        workers: int | None = None,
+    ) -> dict[str, dict[str, float]]:
+        """Generates both the public and the internal DFIQ sites in one build.
+
+        The public site is generated first. Then only the internal site's pages that
+        show an internal component are rendered; the others would be identical in
+        both sites, so they are copied from the public site. As most pages are
+        usually public, this is much faster than generating the two sites separately.
+
+        Args:
+            public_output_path (Path | str): Where to write the public site.
+            internal_output_path (Path | str): Where to write the internal site.
+            incremental (bool): Whether to skip pages whose inputs are unchanged.
+            workers (int, optional): The number of worker processes used to render
+                pages. If not set (or 1), pages are rendered serially.
+
+        Returns:
+            A dict with the "public" and "internal" sites' page timings (as returned
+            by generate_site()).
+        """
+        markdown_output_path = self.markdown_output_path
+        try:
+            self.markdown_output_path = Path(public_output_path)
+            public_timings = self.generate_site(
+                allow_internal=False, incremental=incremental, workers=workers
+            )
+            self.markdown_output_path = Path(internal_output_path)
+            internal_timings = self.generate_site(
+                allow_internal=True,
+                incremental=incremental,
+                workers=workers,
+                shared_output_path=public_output_path,
+            )
+        finally:
+            self.markdown_output_path = markdown_output_path
+        return {"public": public_timings, "internal": internal_timings}
+
+    def _is_page_shared(self, page_type: str, page_id: str | None) -> bool:
+        """Check if a page is the same with or without internal components.
+
+        This is the case if nothing the page shows is internal. Question pages
+        without Approaches aren't generated, so they are never shared.
+        """
+        if page_type == "scenario":
+            scenario = self.components[page_id]
+            dfiq_ids = [page_id]
+            for facet_id in scenario.facets:
+                dfiq_ids.append(facet_id)
+                dfiq_ids.extend(self.components[facet_id].questions)
+            return not any(self.components[i].is_internal for i in dfiq_ids)
+        if page_type == "question":
+            question = self.components[page_id]
+            if not question.approaches or question.is_internal:
+                return False
+            for approach_id in question.approaches:
+                approach = self.components[approach_id]
+                description = approach.description
+                if approach.is_internal or (
+                    isinstance(description, dict)
+                    and description.get("references_internal")
+                ):
+                    return False
+            return True
+        if page_type == "index":
+            return len(self.questions(include_internal=False)) == len(self.questions())
+        if page_type == "glossary":
+            return len(self.approaches(include_internal=False)) == len(
+                self.approaches()
+            )
+        raise ValueError(f"Unknown page type {page_type}")
+
+    def _generate_page(
+        self, page_type: str, page_id: str | None, allow_internal: bool
+    ) -> None:
+        """Generates a single site page (as listed by generate_site())."""
+        if page_type == "scenario":
+            self.generate_scenario_md(page_id, allow_internal=allow_internal)
+        elif page_type == "question":
+            self.generate_question_md(page_id, allow_internal=allow_internal)
+        elif page_type == "index":
+            self.generate_question_index_md(allow_internal=allow_internal)
+        elif page_type == "glossary":
+            self.generate_approach_glossary_md(allow_internal=allow_internal)
+        else:
+            raise ValueError(f"Unknown page type {page_type}")
+
+    def _generate_pages_in_parallel(
+        self, pages: list[tuple[str, str | None]], allow_internal: bool, workers: int
+    ) -> dict[str, float]:
+        """Generates site pages using a pool of worker processes.
+
+        Returns:
+            A dict mapping each page to the number of seconds spent generating it.
+        """
+        import concurrent.futures
+        import multiprocessing
+
+        # Forked workers inherit this instance directly; otherwise it is pickled
+        # once per worker.
+        if multiprocessing.get_start_method() == "fork":
+            _render_worker_state["dfiq"] = self
+            initargs = (None,)
+        else:
+            initargs = (self,)
+
+        # The Question index lists each Question's `all_tags` set unsorted, and set
+        # order is not preserved across processes, so render it here (while the
+        # workers are busy) to keep the output identical to a serial run.
+        local_pages = [page for page in pages if page[0] == "index"]
+        worker_pages = [page for page in pages if page[0] != "index"]
+
+        page_timings = {}
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_render_worker,
+                initargs=initargs,
+            ) as executor:
+                chunk_size = max(1, math.ceil(len(worker_pages) / (workers * 4)))
+                results = executor.map(
+                    _generate_site_page,
+                    [
+                        (page_type, page_id, allow_internal)
+                        for page_type, page_id in worker_pages
+                    ],
+                    chunksize=chunk_size,
+                )
+
+                for page_type, page_id in local_pages:
+                    start_time = time.perf_counter()
+                    self._generate_page(page_type, page_id, allow_internal)
+                    page_key = self._get_page_key(page_type, page_id)
+                    page_timings[page_key] = time.perf_counter() - start_time
+
+                for page_key, page_digest, elapsed in results:
+                    page_timings[page_key] = elapsed
+                    if page_digest and self.site_manifest is not None:
+                        self.site_manifest[page_key] = page_digest
+        finally:
+            _render_worker_state.clear()
+        return page_timings
+
+    @staticmethod
+    def _read_site_manifest(manifest_path: Path) -> dict:
+        """Read the pages from a site manifest, or return {} if it is missing or stale."""
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if manifest.get("version") != SITE_MANIFEST_VERSION:
+            return {}
+        return manifest.get("pages", {})
+
+    def _get_component_fingerprint(self, dfiq_id: str) -> str:
+        """Returns a hash of everything about a component that pages can display."""
+        fingerprint = self._fingerprints.get(dfiq_id)
+        if fingerprint:
+            return fingerprint
+
+        component = self.components.get(dfiq_id)
+        if component:
+            fields = {
+                "id": component.id,
+                "uuid": component.uuid,
+                "type": component.type,
+                "name": component.name,
+                "description": component.description,
+                "tags": component.tags,
+                "all_tags": component.all_tags,
+                "parent_ids": component.parent_ids,
+                "child_ids": component.child_ids,
+                "is_internal": component.is_internal,
+                "view": getattr(component, "view", None),
+            }
+        else:
+            fields = {"id": dfiq_id, "missing": True}
+
+        fingerprint = hashlib.sha256(
+            json.dumps(fields, sort_keys=True, default=sorted).encode("utf-8")
+        ).hexdigest()
+        self._fingerprints[dfiq_id] = fingerprint
+        return fingerprint
+
+    def _get_page_digest(
+        self,
+        template_name: str,
+        allow_internal: bool,
+        component_ids: list[str],
+        extra_inputs: dict | None = None,
+    ) -> str | None:
+        """Returns a hash of all the inputs used to render a page.
+
+        Returns None when the site is not being generated incrementally.
+        """
+        if self.site_manifest is None:
+            return None
+
+        template_digest = self._template_digests.get(template_name)
+        if not template_digest:
+            source, _, _ = self.jinja_env.loader.get_source(
+                self.jinja_env, template_name
+            )
+            template_digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            self._template_digests[template_name] = template_digest
+
+        digest = hashlib.sha256()
+        digest.update(template_digest.encode("utf-8"))
+        digest.update(b"allow_internal" if allow_internal else b"public")
+        if extra_inputs:
+            digest.update(json.dumps(extra_inputs, sort_keys=True).encode("utf-8"))
+        for dfiq_id in component_ids:
+            digest.update(self._get_component_fingerprint(dfiq_id).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_page_output_path(self, page_type: str, page_id: str | None = None) -> Path:
+        """Returns the path of the Markdown file for a site page."""
+        if page_type == "scenario":
+            return Path(self.markdown_output_path, "scenarios", f"{page_id}.md")
+        if page_type == "question":
+            return Path(self.markdown_output_path, "questions", f"{page_id}.md")
+        if page_type == "index":
+            return Path(self.markdown_output_path, "questions", "index.md")
+        if page_type == "glossary":
+            return Path(
+                self.markdown_output_path, "contributing", "approach_glossary.md"
+            )
+        raise ValueError(f"Unknown page type {page_type}")
+
+    def _get_page_key(self, page_type: str, page_id: str | None = None) -> str:
+        """Returns the key of a site page in the site manifest."""
+        output_path = self._get_page_output_path(page_type, page_id)
+        return output_path.relative_to(self.markdown_output_path).as_posix()
+
+    def _is_page_current(self, output_path: Path, page_digest: str | None) -> bool:
+        """Check if a page was already generated from the same inputs."""
+        if page_digest is None:
+            return False
+        page_key = output_path.relative_to(self.markdown_output_path).as_posix()
+        if self.site_manifest.get(page_key) != page_digest:
+            return False
+        if not output_path.exists():
+            return False
+        logging.debug(f"Skipped unchanged page {page_key}")
+        return True
+
+    def _record_page(self, output_path: Path, page_digest: str | None) -> None:
+        """Record the inputs a page was generated from in the site manifest."""
+        if page_digest is None:
+            return
+        page_key = output_path.relative_to(self.markdown_output_path).as_posix()
+        self.site_manifest[page_key] = page_digest
 
     def generate_scenario_sitemap_md(self, allow_internal: bool = False) -> None:
         """Generates a Markdown sitemap for the Scenarios.
@@ -626,11 +2595,20 @@ class DFIQ:
         if not self.markdown_output_path:
             raise ValueError("Markdown output path not specified")
 
+        output_path = self._get_page_output_path("index")
+        page_digest = self._get_page_digest(
+            "questions_index.jinja2",
+            allow_internal,
+            [question.id for question in self.questions()],
+        )
+        if self._is_page_current(output_path, page_digest):
+            return
+
         template = self.jinja_env.get_template("questions_index.jinja2")
         context = {"components": self.components, "allow_internal": allow_internal}
         content = template.render(context)
-        output_path = Path(self.markdown_output_path, "questions", "index.md")
         self.write_content_to_file(content, output_path)
+        self._record_page(output_path, page_digest)
         logging.info(f"Wrote Markdown for Question Index to {output_path.resolve()}")
 
     def generate_approach_glossary_md(self, allow_internal: bool = False) -> None:
@@ -639,35 +2617,6 @@ class DFIQ:
         Args:
             allow_internal (bool): Check if generating from internal items is allowed.
         """
-        data_type_and_value = {}
-        processor_and_analysis_names = {}
-        analysis_step_types = set()
-        step_variables = set()
-        for dfiq_id, component in self.components.items():
-            if not isinstance(component, Approach):
-                continue
-
-            if not allow_internal and component.is_internal:
-                continue
-
-            for d in component.view.get("data"):
-                if not data_type_and_value.get(d["type"]):
-                    data_type_and_value[d["type"]] = set()
-                data_type_and_value[d["type"]].add(d["value"])
-
-            for p in component.view.get("processors"):
-                if not processor_and_analysis_names.get(p["name"]):
-                    processor_and_analysis_names[p["name"]] = set()
-
-                for analysis in p["analysis"]:
-                    processor_and_analysis_names[p["name"]].add(analysis["name"])
-
-                    for step in analysis["steps"]:
-                        analysis_step_types.add(step["type"])
-                        m = re.findall(r"\{[A-z0-9_ -]{2,}?\}", step["value"])
-                        if m:
-                            step_variables.update(m)
-
         if not self.markdown_output_path:
             raise ValueError("Markdown output path not specified")
 
@@ -682,6 +2631,38 @@ class DFIQ:
             "placeholder or when more robust, programmatic data types do not fit.",
         }
 
+        output_path = self._get_page_output_path("glossary")
+        page_digest = self._get_page_digest(
+            "approach_glossary.jinja2",
+            allow_internal,
+            [approach.id for approach in self.approaches()],
+            extra_inputs=descriptions,
+        )
+        if self._is_page_current(output_path, page_digest):
+            return
+
+        def used_keys(field: str) -> list:
+            """The step catalog's keys for a field, if any allowed Approach uses them."""
+            return [
+                key
+                for key, approach_ids in self.step_catalog.entries[field].items()
+                if allow_internal
+                or any(not self.components[i].is_internal for i in approach_ids)
+            ]
+
+        data_type_and_value = {}
+        for data_type, value in used_keys("data"):
+            data_type_and_value.setdefault(data_type, set()).add(value)
+
+        processor_and_analysis_names = {}
+        for processor in used_keys("processor"):
+            processor_and_analysis_names[processor] = set()
+        for processor, analysis in used_keys("analysis"):
+            processor_and_analysis_names[processor].add(analysis)
+
+        analysis_step_types = set(used_keys("step_type"))
+        step_variables = set(used_keys("variable"))
+
         template = self.jinja_env.get_template("approach_glossary.jinja2")
         context = {
             "data_type_and_value": data_type_and_value,
@@ -692,8 +2673,83 @@ class DFIQ:
             "components": self.components,
         }
         content = template.render(context)
-        output_path = Path(
-            self.markdown_output_path, "contributing", "approach_glossary.md"
-        )
         self.write_content_to_file(content, output_path)
+        self._record_page(output_path, page_digest)
         logging.info(f"Wrote Markdown for Approach Glossary to {output_path.resolve()}")
+
+
+# State for the worker processes used by DFIQ._load_yaml_files_in_parallel().
+_worker_schemas = {}
+_worker_log_records = []
+
+
+class _LogRecordCollector(logging.Handler):
+    """Collects log messages in a worker process so the parent can re-emit them."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        _worker_log_records.append((record.levelno, record.getMessage()))
+
+
+def _init_load_worker(schemas: dict) -> None:
+    """Initialize a worker process for loading DFIQ YAML files."""
+    _worker_schemas.update(schemas)
+    logging.getLogger().handlers = [_LogRecordCollector()]
+
+
+def _load_yaml_files_chunk(
+    chunk: tuple[str, list[str], bool, bool],
+) -> tuple[list, list, dict]:
+    """Load a chunk of DFIQ YAML files of one type in a worker process.
+
+    Returns:
+        A tuple of the loaded components (None for files that failed parsing or
+        validation), the (level, message) pairs logged while loading them (both in
+        file order), and the LoadStats measured while loading them, as a dict.
+    """
+    dfiq_type, yaml_file_paths, per_file_stats, single_parse = chunk
+    _worker_log_records.clear()
+    stats = LoadStats(per_file=per_file_stats)
+    load_yaml_file = (
+        DFIQ.load_yaml_file if single_parse else DFIQ._load_yaml_file_legacy
+    )
+    loaded = []
+    for yaml_file_path in yaml_file_paths:
+        start_time = time.perf_counter()
+        loaded.append(load_yaml_file(yaml_file_path, _worker_schemas[dfiq_type], stats))
+        stats.add_file_time(yaml_file_path, time.perf_counter() - start_time)
+    return loaded, list(_worker_log_records), stats.to_dict()
+
+
+# State for the worker processes used by DFIQ._generate_pages_in_parallel().
+_render_worker_state = {}
+
+
+def _init_render_worker(dfiq_instance: DFIQ | None) -> None:
+    """Initialize a worker process for generating site pages."""
+    if dfiq_instance is not None:
+        _render_worker_state["dfiq"] = dfiq_instance
+    # Each worker renders with its own Jinja environment.
+    dfiq_instance = _render_worker_state["dfiq"]
+    dfiq_instance.jinja_env = dfiq_instance._make_jinja_env()
+
+
+def _generate_site_page(
+    page: tuple[str, str | None, bool],
+) -> tuple[str, str | None, float]:
+    """Generate one site page in a worker process.
+
+    Returns:
+        A tuple of the page's key, its entry in the site manifest (if any), and the
+        number of seconds spent generating it.
+    """
+    page_type, page_id, allow_internal = page
+    dfiq_instance = _render_worker_state["dfiq"]
+    start_time = time.perf_counter()
+    dfiq_instance._generate_page(page_type, page_id, allow_internal)
+    elapsed = time.perf_counter() - start_time
+
+    page_key = dfiq_instance._get_page_key(page_type, page_id)
+    page_digest = None
+    if dfiq_instance.site_manifest is not None:
+        page_digest = dfiq_instance.site_manifest.get(page_key)
+    return page_key, page_digest, elapsed
@@ -0,0 +1,238 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+from typing import Mapping
+
+# Bump this whenever the layout of DFIQDiff.to_dict() changes.
+DIFF_FORMAT_VERSION = 1
+
+# The fields of a component compared by a diff. Derived fields (`child_ids` and
+# `all_tags`) are left out; changes to them show up as changes to the children.
+COMPARED_FIELDS = ("uuid", "name", "description", "tags", "parent_ids", "is_internal")
+
+CHANGE_KINDS = ("added", "removed", "renumbered", "changed")
+
+
+def get_content_hash(component) -> bytes:
+    """Returns a hash of a component's own content (but not of its children)."""
+    fields = {field: getattr(component, field) for field in COMPARED_FIELDS}
+    fields["id"] = component.id
+    fields["type"] = component.type
+    fields["view"] = getattr(component, "view", None)
+    return hashlib.sha256(
+        json.dumps(fields, sort_keys=True, default=sorted).encode("utf-8")
+    ).digest()
+
+
+class ComponentChange(object):
+    """A change to one component between two versions of a DFIQ corpus.
+
+    Attributes:
+        kind (str): "added", "removed", "renumbered" (the same UUID has a new ID),
+            or "changed".
+        type (str): The component's type, like "question".
+        id (str): The component's ID (its new ID, if it was renumbered).
+        old_id (str, optional): The component's previous ID, if it was renumbered.
+        fields (list[str]): The fields that changed, for "changed" and "renumbered"
+            components. Changes to an Approach's `view` are listed by key, like
+            "view.processors".
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        dfiq_type: str,
+        dfiq_id: str,
+        fields: list[str] | None = None,
+        old_id: str | None = None,
+    ) -> None:
+        self.kind = kind
+        self.type = dfiq_type
+        self.id = dfiq_id
+        self.old_id = old_id
+        self.fields = fields or []
+
+    def __repr__(self) -> str:
+        return (
+            f"ComponentChange({self.kind!r}, {self.type!r}, {self.id!r}, "
+            f"fields={self.fields!r}, old_id={self.old_id!r})"
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the change as a JSON-serializable dict."""
+        change = {"kind": self.kind, "type": self.type, "id": self.id}
+        if self.old_id:
+            change["old_id"] = self.old_id
+        if self.fields:
+            change["fields"] = self.fields
+        return change
+
+
+class DFIQDiff(object):
+    """The changes between two versions of a DFIQ corpus.
+
+    Attributes:
+        changes (list[ComponentChange]): The changed components, sorted by kind
+            and ID.
+        edges_added (set[tuple[str, str]]): The (parent ID, child ID) edges only in
+            the new version.
+        edges_removed (set[tuple[str, str]]): The (parent ID, child ID) edges only
+            in the old version.
+    """
+
+    def __init__(
+        self,
+        changes: list[ComponentChange],
+        edges_added: set[tuple[str, str]],
+        edges_removed: set[tuple[str, str]],
+    ) -> None:
+        self.changes = changes
+        self.edges_added = edges_added
+        self.edges_removed = edges_removed
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.edges_added or self.edges_removed)
+
+    def get_changes(
+        self, kind: str | None = None, dfiq_type: str | None = None
+    ) -> list[ComponentChange]:
+        """Returns the changes of a kind (like "added") and/or component type."""
+        return [
+            change
+            for change in self.changes
+            if (kind is None or change.kind == kind)
+            and (dfiq_type is None or change.type == dfiq_type)
+        ]
+
+    def get_reparented(self) -> dict[str, tuple[list[str], list[str]]]:
+        """Returns the components in both versions whose parents changed.
+
+        Returns:
+            A dict mapping each component's ID to a tuple of its removed and added
+            parent IDs.
+        """
+        reparented = {}
+        for change in self.changes:
+            if change.kind != "added" and "parent_ids" in change.fields:
+                reparented[change.id] = ([], [])
+        for parent_id, child_id in self.edges_removed:
+            if child_id in reparented:
+                reparented[child_id][0].append(parent_id)
+        for parent_id, child_id in self.edges_added:
+            if child_id in reparented:
+                reparented[child_id][1].append(parent_id)
+        for removed, added in reparented.values():
+            removed.sort()
+            added.sort()
+        return reparented
+
+    def to_dict(self) -> dict:
+        """Returns the diff as a JSON-serializable dict, for changelogs."""
+        return {
+            "version": DIFF_FORMAT_VERSION,
+            "changes": [change.to_dict() for change in self.changes],
+            "edges_added": sorted(self.edges_added),
+            "edges_removed": sorted(self.edges_removed),
+        }
+
+
+def diff_components(
+    old_components: Mapping,
+    old_hashes: dict[str, bytes],
+    new_components: Mapping,
+    new_hashes: dict[str, bytes],
+) -> DFIQDiff:
+    """Diff two versions of a corpus, given each component's content hash.
+
+    Only the components whose hashes differ are compared field by field. As a
+    component's parent IDs are part of its hash, the edges that changed are all
+    parent edges of those components, so the hierarchy is diffed without walking
+    either graph.
+    """
+    old_items = old_hashes.items()
+    new_items = new_hashes.items()
+    # Set operations on dict item views run in C, so finding the components whose
+    # hashes differ is fast even when almost nothing changed.
+    differing_ids = {dfiq_id for dfiq_id, _ in old_items ^ new_items}
+
+    added_ids = []
+    removed_ids = []
+    changes = []
+    edges_added = set()
+    edges_removed = set()
+    for dfiq_id in differing_ids:
+        old = old_components.get(dfiq_id) if dfiq_id in old_hashes else None
+        new = new_components.get(dfiq_id) if dfiq_id in new_hashes else None
+        old_parent_ids = set(old.parent_ids) if old else set()
+        new_parent_ids = set(new.parent_ids) if new else set()
+        edges_removed.update(
+            (parent_id, dfiq_id) for parent_id in old_parent_ids - new_parent_ids
+        )
+        edges_added.update(
+            (parent_id, dfiq_id) for parent_id in new_parent_ids - old_parent_ids
+        )
+        if not old:
+            added_ids.append(dfiq_id)
+        elif not new:
+            removed_ids.append(dfiq_id)
+        else:
+            changes.append(
+                ComponentChange(
+                    "changed", new.type, dfiq_id, _get_changed_fields(old, new)
+                )
+            )
+
+    # A component whose ID changed but whose UUID didn't was renumbered.
+    removed_by_uuid = {old_components[dfiq_id].uuid: dfiq_id for dfiq_id in removed_ids}
+    for dfiq_id in added_ids:
+        new = new_components[dfiq_id]
+        old_id = removed_by_uuid.pop(new.uuid, None)
+        if old_id:
+            old = old_components[old_id]
+            fields = _get_changed_fields(old, new)
+            changes.append(
+                ComponentChange("renumbered", new.type, dfiq_id, fields, old_id)
+            )
+        else:
+            changes.append(ComponentChange("added", new.type, dfiq_id))
+    for dfiq_id in removed_by_uuid.values():
+        changes.append(
+            ComponentChange("removed", old_components[dfiq_id].type, dfiq_id)
+        )
+
+    changes.sort(key=lambda change: (CHANGE_KINDS.index(change.kind), change.id))
+    return DFIQDiff(changes, edges_added, edges_removed)
+
+
+def _get_changed_fields(old, new) -> list[str]:
+    """Returns the names of the fields that differ between two components."""
+    fields = []
+    for field in COMPARED_FIELDS:
+        old_value = getattr(old, field)
+        new_value = getattr(new, field)
+        if field == "parent_ids":
+            old_value = set(old_value or ())
+            new_value = set(new_value or ())
+        if old_value != new_value:
+            fields.append(field)
+    old_view = getattr(old, "view", None) or {}
+    new_view = getattr(new, "view", None) or {}
+    for key in sorted(old_view.keys() | new_view.keys()):
+        if old_view.get(key) != new_view.get(key):
+            fields.append(f"view.{key}")
+    if old.type != new.type:
+        fields.append("type")
+    return fields
@@ -0,0 +1,129 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable, Iterator
+
+
+class Hierarchy(object):
+    """A lightweight directed graph of DFIQ component IDs, from parents to children.
+
+    DFIQ only needs to look up a component's parents and children, so this keeps
+    two adjacency dicts (node -> set of children, node -> set of parents) instead
+    of a full graph library. It implements the small part of the networkx.DiGraph
+    API that DFIQ uses; to_networkx() converts it for anything else (like drawing).
+
+    Like networkx, adding an edge adds both of its nodes, so parent IDs that don't
+    match a loaded component still appear as nodes.
+    """
+
+    def __init__(self) -> None:
+        self._children = {}
+        self._parents = {}
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._children
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._children)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Hierarchy):
+            return NotImplemented
+        return self._children == other._children
+
+    @property
+    def nodes(self) -> list[str]:
+        """All nodes in the graph, in the order they were added."""
+        return list(self._children)
+
+    @property
+    def edges(self) -> list[tuple[str, str]]:
+        """All (parent, child) edges in the graph."""
+        return [
+            (parent, child)
+            for parent, children in self._children.items()
+            for child in children
+        ]
+
+    def number_of_edges(self) -> int:
+        """Returns the number of edges in the graph."""
+        return sum(len(children) for children in self._children.values())
+
+    def add_node(self, node: str) -> None:
+        """Add a node, if it isn't in the graph already."""
+        if node not in self._children:
+            self._children[node] = set()
+            self._parents[node] = set()
+
+    def add_nodes_from(self, nodes: Iterable[str]) -> None:
+        """Add several nodes."""
+        for node in nodes:
+            self.add_node(node)
+
+    def add_edge(self, parent: str, child: str) -> None:
+        """Add an edge from a parent to a child, adding either node if needed."""
+        self.add_node(parent)
+        self.add_node(child)
+        self._children[parent].add(child)
+        self._parents[child].add(parent)
+
+    def has_node(self, node: str) -> bool:
+        """Returns whether a node is in the graph."""
+        return node in self._children
+
+    def has_edge(self, parent: str, child: str) -> bool:
+        """Returns whether an edge from parent to child is in the graph."""
+        return child in self._children.get(parent, ())
+
+    def remove_edge(self, parent: str, child: str) -> None:
+        """Remove an edge (but not its nodes)."""
+        self._children[parent].discard(child)
+        self._parents[child].discard(parent)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all edges to or from it."""
+        for child in self._children.pop(node):
+            self._parents[child].discard(node)
+        for parent in self._parents.pop(node):
+            self._children[parent].discard(node)
+
+    def successors(self, node: str) -> Iterator[str]:
+        """Iterate over a node's children."""
+        return iter(self._children[node])
+
+    def predecessors(self, node: str) -> Iterator[str]:
+        """Iterate over a node's parents."""
+        return iter(self._parents[node])
+
+    def to_networkx(self):
+        """Returns the graph as a networkx.DiGraph (networkx is only imported here).
+
+        Raises:
+            ImportError: If networkx, an optional dependency, is not installed.
+        """
+        try:
+            import networkx as nx
+        except ImportError as e:
+            raise ImportError(
+                "Hierarchy.to_networkx() requires networkx; install it with "
+                '"pip install dfiq[graph]"'
+            ) from e
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._children)
+        graph.add_edges_from(self.edges)
+        return graph
@@ -0,0 +1,480 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .dfiq import DFIQ, Approach, Facet, Question, Scenario
+
+# Bump this whenever the layout of a mapped snapshot changes.
+MAPPED_FORMAT_VERSION = 1
+
+MAPPED_MAGIC = b"DFIQMAP\x00"
+
+# Written in native byte order; readers check this to detect a mismatch.
+BYTE_ORDER_MARK = 0x01020304
+
+# Marks a missing string (like the `view` of anything but an Approach).
+NO_STRING = 0xFFFFFFFF
+
+COMPONENT_TYPES = ["scenario", "facet", "question", "approach"]
+COMPONENT_CLASSES = {
+    "scenario": Scenario,
+    "facet": Facet,
+    "question": Question,
+    "approach": Approach,
+}
+
+# The (include_internal, with_approaches_only) variants of each type's index.
+INDEX_VARIANTS = [(True, False), (False, False), (True, True), (False, True)]
+
+# After the magic bytes, the file is an array of 32-bit words. The header is the
+# first HEADER_WORDS of them.
+HEADER_WORDS = 16
+(
+    VERSION,
+    BYTE_ORDER,
+    STRING_COUNT,
+    COMPONENT_COUNT,
+    STRING_OFFSETS_START,
+    RECORDS_START,
+    TYPE_INDEX_START,
+    TAG_INDEX_START,
+    STRINGS_START,
+) = range(9)
+
+# Each component record is RECORD_WORDS words. Strings are indexes into the
+# string table, and lists are (start, length) pairs of word positions.
+RECORD_WORDS = 15
+(
+    RECORD_ID,
+    RECORD_UUID,
+    RECORD_NAME,
+    RECORD_DESCRIPTION,
+    RECORD_VIEW,
+    RECORD_TYPE,
+    RECORD_IS_INTERNAL,
+    RECORD_TAGS,
+    RECORD_TAGS_LENGTH,
+    RECORD_ALL_TAGS,
+    RECORD_ALL_TAGS_LENGTH,
+    RECORD_PARENT_IDS,
+    RECORD_PARENT_IDS_LENGTH,
+    RECORD_CHILD_IDS,
+    RECORD_CHILD_IDS_LENGTH,
+) = range(RECORD_WORDS)
+
+
+def write_mapped_snapshot(components: Iterable, path: Path | str) -> None:
+    """Atomically write a mapped snapshot of the components to a file.
+
+    A mapped snapshot is a read-only binary file laid out so that MappedDFIQ can
+    query it in place, through mmap: a string table, fixed-size component records,
+    and the per-type and tag indexes, all referring to each other by offset.
+
+    The file replaces any existing one at `path` atomically, so processes that
+    still have the old file mapped keep a consistent view of it.
+
+    Each component's `child_ids` and `all_tags` (and the indexes built from them)
+    are recomputed over just the given components, as they would be if the
+    snapshot were loaded as a corpus of its own. This way a snapshot without
+    internal components doesn't refer to (or list the tags of) any of them.
+
+    Args:
+        components (Iterable): The components to write.
+        path (Path | str): The snapshot file to write.
+    """
+    components = sorted(components, key=lambda x: x.id)
+    record_numbers = {component.id: i for i, component in enumerate(components)}
+
+    # Components are sorted by ID, so each list of children is too.
+    child_ids = {component.id: [] for component in components}
+    all_tags = {component.id: set(component.tags) for component in components}
+    for component in components:
+        for parent_id in component.parent_ids:
+            if parent_id in child_ids:
+                child_ids[parent_id].append(component.id)
+                if component.type == "approach":
+                    all_tags[parent_id].update(component.tags)
+
+    strings = {}
+
+    def add_string(value: str | None) -> int:
+        if value is None:
+            return NO_STRING
+        return strings.setdefault(value, len(strings))
+
+    # Variable-length lists go after the fixed-size sections, so their positions
+    # are collected relative to `lists` and offset once the sizes are known.
+    lists = array.array("I")
+
+    def add_list(values: list[int]) -> tuple[int, int]:
+        start = len(lists)
+        lists.extend(values)
+        return start, len(values)
+
+    records = array.array("I")
+    for component in components:
+        description = json.dumps(component.description, separators=(",", ":"))
+        view = None
+        if component.type == "approach":
+            view = json.dumps(component.view, separators=(",", ":"))
+        records.extend(
+            [
+                add_string(component.id),
+                add_string(component.uuid),
+                add_string(component.name),
+                add_string(description),
+                add_string(view),
+                COMPONENT_TYPES.index(component.type),
+                int(component.is_internal),
+                *add_list([add_string(tag) for tag in component.tags]),
+                *add_list([add_string(tag) for tag in sorted(all_tags[component.id])]),
+                *add_list([add_string(i) for i in sorted(component.parent_ids)]),
+                *add_list([add_string(i) for i in child_ids[component.id]]),
+            ]
+        )
+
+    type_index = array.array("I")
+    tag_index = array.array("I")
+    for component_type in COMPONENT_TYPES:
+        of_type = [c for c in components if c.type == component_type]
+        for include_internal, with_approaches_only in INDEX_VARIANTS:
+            type_index.extend(
+                add_list(
+                    [
+                        record_numbers[c.id]
+                        for c in of_type
+                        if (include_internal or not c.is_internal)
+                        and (not with_approaches_only or child_ids[c.id])
+                        and (not with_approaches_only or c.type == "question")
+                    ]
+                )
+            )
+
+        postings = {}
+        for component in of_type:
+            for tag in all_tags[component.id]:
+                postings.setdefault(tag, []).append(record_numbers[component.id])
+        entries = []
+        for tag in sorted(postings):
+            entries.extend([add_string(tag), *add_list(postings[tag])])
+        tag_index.extend(add_list(entries))
+
+    encoded_strings = [value.encode("utf-8") for value in strings]
+    string_offsets = array.array("I", [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    string_offsets_start = HEADER_WORDS
+    records_start = string_offsets_start + len(string_offsets)
+    type_index_start = records_start + len(records)
+    tag_index_start = type_index_start + len(type_index)
+    lists_start = tag_index_start + len(tag_index)
+    strings_start = len(MAPPED_MAGIC) + 4 * (lists_start + len(lists))
+
+    # Point list positions at their final word positions.
+    for i in range(len(components)):
+        for field in (
+            RECORD_TAGS,
+            RECORD_ALL_TAGS,
+            RECORD_PARENT_IDS,
+            RECORD_CHILD_IDS,
+        ):
+            records[i * RECORD_WORDS + field] += lists_start
+    for i in range(0, len(type_index), 2):
+        type_index[i] += lists_start
+    for i in range(0, len(tag_index), 2):
+        tag_index[i] += lists_start
+        start, length = tag_index[i], tag_index[i + 1]
+        for entry in range(start, start + length, 3):
+            lists[entry - lists_start + 1] += lists_start
+
+    header = array.array("I", [0] * HEADER_WORDS)
+    header[VERSION] = MAPPED_FORMAT_VERSION
+    header[BYTE_ORDER] = BYTE_ORDER_MARK
+    header[STRING_COUNT] = len(encoded_strings)
+    header[COMPONENT_COUNT] = len(components)
+    header[STRING_OFFSETS_START] = string_offsets_start
+    header[RECORDS_START] = records_start
+    header[TYPE_INDEX_START] = type_index_start
+    header[TAG_INDEX_START] = tag_index_start
+    header[STRINGS_START] = strings_start
+
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, mode="wb") as file:
+        file.write(MAPPED_MAGIC)
+        for section in (header, string_offsets, records, type_index, tag_index, lists):
+            section.tofile(file)
+        file.write(b"".join(encoded_strings))
+    os.replace(temp_path, path)
+
+
+class ComponentMapping(Mapping):
+    """A read-only mapping from component IDs to components, backed by MappedDFIQ.
+
+    Components are decoded from the snapshot each time they are looked up.
+    """
+
+    def __init__(self, mapped_dfiq: "MappedDFIQ") -> None:
+        self._mapped_dfiq = mapped_dfiq
+
+    def __getitem__(self, dfiq_id: str) -> Scenario | Facet | Question | Approach:
+        record_number = self._mapped_dfiq._find_record(dfiq_id)
+        if record_number is None:
+            raise KeyError(dfiq_id)
+        return self._mapped_dfiq._get_component(record_number)
+
+    def __contains__(self, dfiq_id: object) -> bool:
+        return (
+            isinstance(dfiq_id, str)
+            and self._mapped_dfiq._find_record(dfiq_id) is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for record_number in range(len(self)):
+            yield self._mapped_dfiq._get_record_string(record_number, RECORD_ID)
+
+    def __len__(self) -> int:
+        return self._mapped_dfiq._words[COMPONENT_COUNT]
+
+
+class MappedDFIQ(object):
+    """A read-only DFIQ knowledge base, queried in place from a mapped snapshot.
+
+    The snapshot (written by DFIQ.export(path, format="mapped")) is memory-mapped,
+    so processes that open the same file share one physical copy of it through
+    the page cache, instead of each loading and holding its own components. Only
+    the components a query returns are decoded (into ordinary Scenario, Facet,
+    Question, and Approach objects).
+
+    This supports the read-only parts of the DFIQ API: `components`, scenarios(),
+    facets(), questions(), approaches(), and find().
+
+    Attributes:
+        snapshot_path (Path): The path of the mapped snapshot.
+        components (Mapping): A read-only mapping from component IDs to components.
+    """
+
+    def __init__(self, snapshot_path: Path | str) -> None:
+        self.snapshot_path = Path(snapshot_path)
+        with open(self.snapshot_path, mode="rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_end = len(MAPPED_MAGIC) + 4 * HEADER_WORDS
+        header = struct.unpack(
+            f"={HEADER_WORDS}I", self._mmap[len(MAPPED_MAGIC) : header_end]
+        )
+        if self._mmap[: len(MAPPED_MAGIC)] != MAPPED_MAGIC:
+            error = f"{snapshot_path} is not a mapped DFIQ snapshot"
+        elif header[BYTE_ORDER] != BYTE_ORDER_MARK:
+            error = f"{snapshot_path} was written with another byte order"
+        elif header[VERSION] != MAPPED_FORMAT_VERSION:
+            error = f"{snapshot_path} has an unsupported mapped snapshot version"
+        else:
+            error = None
+        if error:
+            self._mmap.close()
+            raise ValueError(error)
+
+        # Views into the mapping, so reading them doesn't copy the file.
+        self._view = memoryview(self._mmap)
+        self._words = self._view[len(MAPPED_MAGIC) : header[STRINGS_START]].cast("I")
+        self._strings = self._view[header[STRINGS_START] :]
+        self.components = ComponentMapping(self)
+
+    def close(self) -> None:
+        """Unmap the snapshot. Components already returned stay usable."""
+        for view in (self._words, self._strings, self._view):
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedDFIQ":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def scenarios(self, include_internal: bool = True) -> list[Scenario]:
+        """Returns a list of all Scenarios, sorted by ID."""
+        return self._get_index("scenario", include_internal)
+
+    def facets(self, include_internal: bool = True) -> list[Facet]:
+        """Returns a list of all Facets, sorted by ID."""
+        return self._get_index("facet", include_internal)
+
+    def questions(
+        self, include_internal: bool = True, with_approaches_only: bool = False
+    ) -> list[Question]:
+        """Returns a list of all Questions, sorted by ID."""
+        return self._get_index("question", include_internal, with_approaches_only)
+
+    def approaches(self, include_internal: bool = True) -> list[Approach]:
+        """Returns a list of all Approaches, sorted by ID."""
+        return self._get_index("approach", include_internal)
+
+    def find(
+        self,
+        tags_all: list[str] | set[str] | None = None,
+        tags_any: list[str] | set[str] | None = None,
+        component_type: str | None = None,
+        include_internal: bool = True,
+    ) -> list[Scenario | Facet | Question | Approach]:
+        """Find components by their tags, like DFIQ.find()."""
+        if component_type:
+            if component_type not in COMPONENT_TYPES:
+                raise ValueError(f"Unknown component type {component_type}")
+            component_types = [component_type]
+        else:
+            component_types = COMPONENT_TYPES
+
+        results = []
+        for component_type in component_types:
+            if tags_all or tags_any:
+                postings = [
+                    self._get_postings(component_type, tag) for tag in tags_all or []
+                ]
+                if tags_any:
+                    postings.append(
+                        DFIQ._union_sorted(
+                            [self._get_postings(component_type, t) for t in tags_any]
+                        )
+                    )
+                record_numbers = DFIQ._intersect_sorted(postings)
+            else:
+                record_numbers = self._get_index_records(
+                    component_type, include_internal, False
+                )
+
+            for record_number in record_numbers:
+                if not include_internal and self._get_record_word(
+                    record_number, RECORD_IS_INTERNAL
+                ):
+                    continue
+                results.append(self._get_component(record_number))
+        return results
+
+    def _get_index(
+        self,
+        component_type: str,
+        include_internal: bool = True,
+        with_approaches_only: bool = False,
+    ) -> list:
+        """Decode the components in one of a type's prebuilt indexes."""
+        return [
+            self._get_component(record_number)
+            for record_number in self._get_index_records(
+                component_type, include_internal, with_approaches_only
+            )
+        ]
+
+    def _get_index_records(
+        self, component_type: str, include_internal: bool, with_approaches_only: bool
+    ) -> memoryview:
+        """Returns the record numbers in one of a type's prebuilt indexes."""
+        position = self._words[TYPE_INDEX_START] + 2 * (
+            len(INDEX_VARIANTS) * COMPONENT_TYPES.index(component_type)
+            + INDEX_VARIANTS.index((include_internal, with_approaches_only))
+        )
+        return self._get_list(position)
+
+    def _get_postings(self, component_type: str, tag: str) -> list[int]:
+        """Returns the sorted record numbers of components of a type with a tag."""
+        position = self._words[TAG_INDEX_START] + 2 * COMPONENT_TYPES.index(
+            component_type
+        )
+        entries = self._get_list(position)
+        low, high = 0, len(entries) // 3
+        while low < high:
+            middle = (low + high) // 2
+            entry_tag = self._get_string(entries[3 * middle])
+            if entry_tag == tag:
+                start = entries[3 * middle + 1]
+                return self._words[start : start + entries[3 * middle + 2]].tolist()
+            if entry_tag < tag:
+                low = middle + 1
+            else:
+                high = middle
+        return []
+
+    def _find_record(self, dfiq_id: str) -> int | None:
+        """Binary search the (ID-sorted) records for a component ID."""
+        low, high = 0, self._words[COMPONENT_COUNT]
+        while low < high:
+            middle = (low + high) // 2
+            record_id = self._get_record_string(middle, RECORD_ID)
+            if record_id == dfiq_id:
+                return middle
+            if record_id < dfiq_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _get_component(
+        self, record_number: int
+    ) -> Scenario | Facet | Question | Approach:
+        """Decode a component record into a component object."""
+        start = self._words[RECORDS_START] + record_number * RECORD_WORDS
+        record = self._words[start : start + RECORD_WORDS]
+        component_type = COMPONENT_TYPES[record[RECORD_TYPE]]
+        component = object.__new__(COMPONENT_CLASSES[component_type])
+        component.id = sys.intern(self._get_string(record[RECORD_ID]))
+        component.uuid = self._get_string(record[RECORD_UUID])
+        component.name = self._get_string(record[RECORD_NAME])
+        component.description = json.loads(self._get_string(record[RECORD_DESCRIPTION]))
+        component.type = component_type
+        component.is_internal = bool(record[RECORD_IS_INTERNAL])
+        component.tags = tuple(self._get_strings(start + RECORD_TAGS))
+        component.all_tags = frozenset(self._get_strings(start + RECORD_ALL_TAGS))
+        component.parent_ids = frozenset(self._get_strings(start + RECORD_PARENT_IDS))
+        component.child_ids = self._get_strings(start + RECORD_CHILD_IDS)
+        if isinstance(component, Approach):
+            component.view = json.loads(self._get_string(record[RECORD_VIEW]))
+        return component
+
+    def _get_record_word(self, record_number: int, field: int) -> int:
+        """Returns one word of a component record."""
+        start = self._words[RECORDS_START] + record_number * RECORD_WORDS
+        return self._words[start + field]
+
+    def _get_record_string(self, record_number: int, field: int) -> str:
+        """Returns a string field of a component record."""
+        return self._get_string(self._get_record_word(record_number, field))
+
+    def _get_list(self, position: int) -> memoryview:
+        """Returns the list whose (start, length) pair is at a word position."""
+        start, length = self._words[position], self._words[position + 1]
+        return self._words[start : start + length]
+
+    def _get_strings(self, position: int) -> list[str]:
+        """Returns the strings in the list whose (start, length) pair is at a position."""
+        return [self._get_string(i) for i in self._get_list(position)]
+
+    def _get_string(self, string_number: int) -> str:
+        """Returns a string from the string table."""
+        if string_number == NO_STRING:
+            raise ValueError("A required string is missing from the mapped snapshot")
+        offsets_start = self._words[STRING_OFFSETS_START] + string_number
+        start, end = self._words[offsets_start], self._words[offsets_start + 1]
+        return str(self._strings[start:end], "utf-8")
@@ -0,0 +1,180 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable
+
+
+class ArtifactMatcher(object):
+    """Finds the Questions that can be answered with a set of collected data.
+
+    An Approach's `view.data` entries are alternatives (they are "OR"d), so an
+    Approach can be followed if any one of them was collected, and a Question can
+    be answered if any of its Approaches can. `description` entries are free text
+    that can't be matched, so they are ignored.
+
+    The matcher precompiles this into one bitset of Questions per data (type,
+    value) pair, plus a bitset of the Questions under each Facet and Scenario.
+    Matching a case is then an OR of the bitsets of the data it collected, and
+    coverage is a popcount per Facet and Scenario.
+
+    Attributes:
+        question_ids (list[str]): The sorted IDs of the Questions that can be
+            matched; Question N is bit N of each bitset.
+        data_masks (dict): Maps each (type, value) pair to a bitset of the
+            Questions with an Approach that uses it.
+        facet_masks (dict): Maps each Facet ID to a bitset of its Questions.
+        scenario_masks (dict): Maps each Scenario ID to a bitset of the Questions
+            under it.
+    """
+
+    def __init__(
+        self,
+        question_ids: list[str],
+        data_masks: dict[tuple[str, str], int],
+        facet_masks: dict[str, int],
+        scenario_masks: dict[str, int],
+    ) -> None:
+        self.question_ids = question_ids
+        self.data_masks = data_masks
+        self.facet_masks = facet_masks
+        self.scenario_masks = scenario_masks
+
+    @classmethod
+    def from_dfiq(
+        cls, dfiq_instance, include_internal: bool = True
+    ) -> "ArtifactMatcher":
+        """Build a matcher from a DFIQ instance's step catalog and hierarchy."""
+        questions = dfiq_instance.questions(include_internal)
+        question_ids = [question.id for question in questions]
+        question_bits = {dfiq_id: 1 << i for i, dfiq_id in enumerate(question_ids)}
+
+        def get_mask(dfiq_ids: Iterable[str]) -> int:
+            mask = 0
+            for dfiq_id in dfiq_ids:
+                mask |= question_bits.get(dfiq_id, 0)
+            return mask
+
+        data_masks = {}
+        catalog = dfiq_instance.step_catalog
+        for (data_type, value), approach_ids in catalog.entries["data"].items():
+            if data_type == "description":
+                continue
+            mask = 0
+            for approach_id in approach_ids:
+                approach = dfiq_instance.components[approach_id]
+                if include_internal or not approach.is_internal:
+                    mask |= get_mask(approach.parent_ids)
+            if mask:
+                data_masks[(data_type, value)] = mask
+
+        facet_masks = {
+            facet.id: get_mask(facet.child_ids or [])
+            for facet in dfiq_instance.facets(include_internal)
+        }
+        scenario_masks = {
+            scenario.id: get_mask(
+                question.id
+                for question in dfiq_instance.descendants(
+                    scenario.id, component_type="question"
+                )
+            )
+            for scenario in dfiq_instance.scenarios(include_internal)
+        }
+        return cls(question_ids, data_masks, facet_masks, scenario_masks)
+
+    def match(self, collected: Iterable[tuple[str, str] | str]) -> dict:
+        """Match one case's collected data. See match_many()."""
+        return self.match_many([collected])[0]
+
+    def match_many(
+        self, cases: Iterable[Iterable[tuple[str, str] | str]]
+    ) -> list[dict]:
+        """Match the collected data of many cases in one batch.
+
+        Each distinct (type, value) pair in the batch is looked up once, however
+        many cases collected it. Cases that collected the same data are matched
+        once. The Question totals of each Facet and Scenario are counted once for
+        the whole batch.
+
+        Args:
+            cases (Iterable): For each case, the data that was collected, as
+                (type, value) pairs like ("ForensicArtifact", "NTFSUSNJournal").
+                A plain string is taken as the name of a ForensicArtifact.
+
+        Returns:
+            For each case, a dict with:
+                questions (list[str]): The sorted IDs of the answerable Questions.
+                facets (dict): Maps each Facet ID to a tuple of (answerable
+                    Questions, all Questions) under it.
+                scenarios (dict): The same, for each Scenario.
+        """
+        cases = [
+            frozenset(
+                ("ForensicArtifact", data) if isinstance(data, str) else tuple(data)
+                for data in collected
+            )
+            for collected in cases
+        ]
+        data_masks = {
+            data: self.data_masks.get(data, 0) for data in frozenset().union(*cases)
+        }
+        facet_totals = {
+            dfiq_id: mask.bit_count() for dfiq_id, mask in self.facet_masks.items()
+        }
+        scenario_totals = {
+            dfiq_id: mask.bit_count() for dfiq_id, mask in self.scenario_masks.items()
+        }
+
+        results = []
+        results_by_case = {}
+        for collected in cases:
+            result = results_by_case.get(collected)
+            if not result:
+                answerable = 0
+                for data in collected:
+                    answerable |= data_masks[data]
+                result = {
+                    "questions": self._get_question_ids(answerable),
+                    "facets": self._get_coverage(
+                        answerable, self.facet_masks, facet_totals
+                    ),
+                    "scenarios": self._get_coverage(
+                        answerable, self.scenario_masks, scenario_totals
+                    ),
+                }
+                results_by_case[collected] = result
+                results.append(result)
+            else:
+                # Copy repeated results, so each case's result can be changed alone.
+                results.append({key: value.copy() for key, value in result.items()})
+        return results
+
+    @staticmethod
+    def _get_coverage(
+        answerable: int, masks: dict[str, int], totals: dict[str, int]
+    ) -> dict:
+        """Returns {ID: (answerable Questions, all Questions)} for each mask."""
+        return {
+            dfiq_id: ((answerable & mask).bit_count(), totals[dfiq_id])
+            for dfiq_id, mask in masks.items()
+        }
+
+    def _get_question_ids(self, bits: int) -> list[str]:
+        """Returns the IDs of the Questions in a bitset, in order."""
+        question_ids = []
+        while bits:
+            lowest_bit = bits & -bits
+            question_ids.append(self.question_ids[lowest_bit.bit_length() - 1])
+            bits ^= lowest_bit
+        return question_ids
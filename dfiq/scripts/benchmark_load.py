@@ -0,0 +1,131 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import logging
+import pickle
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dfiq import DFIQ
+from dfiq.dfiq import YAML_LOADER
+
+# This file should be called from the repository root:
+# PYTHONPATH=. python dfiq/scripts/benchmark_load.py [--yaml-data-path PATH]
+
+
+def time_load(yaml_data_path: str | None, repeat: int, **kwargs) -> list[float]:
+    """Time loading a DFIQ knowledge base `repeat` times, returning the durations."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        DFIQ(yaml_data_path=yaml_data_path, **kwargs)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def measure_memory(yaml_data_path: str | None) -> float:
+    """Returns the average number of bytes of memory used by each loaded component.
+
+    The components are pickled and then measured while being unpickled, so the
+    number only covers the components themselves (not the YAML parser, schemas, etc).
+    """
+    dfiq_instance = DFIQ(yaml_data_path=yaml_data_path)
+    pickled_components = pickle.dumps(dfiq_instance.components)
+    tracemalloc.start()
+    components = pickle.loads(pickled_components)
+    used_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return used_bytes / len(components)
+
+
+def time_import(repeat: int) -> list[float]:
+    """Time `import dfiq` in fresh interpreters, using `python -X importtime`."""
+    durations = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import dfiq"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # The last line is the top-level "dfiq" import; its cumulative time (in
+        # microseconds) is the second column.
+        cumulative_us = result.stderr.strip().splitlines()[-1].split("|")[1]
+        durations.append(int(cumulative_us) / 1_000_000)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark loading DFIQ YAML files.")
+    parser.add_argument(
+        "--yaml-data-path",
+        help="Base path holding the DFIQ YAML files (defaults to the bundled data).",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Also time loading with a pool of this many worker processes.",
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="Also time `import dfiq` in a fresh interpreter.",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also measure the memory used per loaded component.",
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"YAML loader: {YAML_LOADER.__name__}")
+    results = {
+        "legacy (three parses per file)": time_load(
+            args.yaml_data_path, args.repeat, single_parse=False
+        ),
+        "single parse": time_load(args.yaml_data_path, args.repeat, single_parse=True),
+    }
+    if args.workers:
+        results[f"single parse, {args.workers} workers"] = time_load(
+            args.yaml_data_path, args.repeat, workers=args.workers
+        )
+    for label, durations in results.items():
+        print(
+            f"{label}: median {statistics.median(durations) * 1000:.1f} ms, "
+            f"min {min(durations) * 1000:.1f} ms over {len(durations)} runs"
+        )
+
+    legacy = statistics.median(results.pop("legacy (three parses per file)"))
+    for label, durations in results.items():
+        print(f"speedup ({label}): {legacy / statistics.median(durations):.2f}x")
+
+    if args.import_time:
+        durations = time_import(args.repeat)
+        print(
+            f"import dfiq: median {statistics.median(durations) * 1000:.1f} ms, "
+            f"min {min(durations) * 1000:.1f} ms over {len(durations)} runs"
+        )
+
+    if args.memory:
+        print(f"memory: {measure_memory(args.yaml_data_path):.0f} bytes per component")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from dfiq import DFIQ
+from dfiq.dfiq import YAML_LOADER
+from dfiq.scripts.generate_synthetic_corpus import generate_corpus
+
+# This file should be called from the repository root:
+# PYTHONPATH=. python dfiq/scripts/benchmark_scale.py [--sizes 1k 10k] [--output FILE]
+
+# Bump this whenever the layout of the results changes.
+RESULTS_FORMAT_VERSION = 1
+
+SIZES = {"1k": 1000, "10k": 10000, "100k": 100000}
+
+
+def measure(function: Callable, repeat: int) -> dict:
+    """Time a function `repeat` times, then measure its peak memory use once.
+
+    The memory is measured in a separate run, as tracing allocations slows the
+    function down.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "runs": repeat,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def benchmark_corpus(
+    yaml_data_path: str, templates_path: str, repeat: int, site: bool
+) -> dict:
+    """Benchmark loading, graph building, each accessor, and site generation."""
+    instances = []
+
+    def load() -> None:
+        instances.append(DFIQ(yaml_data_path, templates_path=templates_path))
+
+    results = {"load": measure(load, repeat)}
+    dfiq_instance = instances[0]
+    results["load"]["phases"] = dfiq_instance.stats.timings
+    results["load"]["counters"] = dfiq_instance.stats.counters
+    del instances[1:]
+
+    scenario_ids = [scenario.id for scenario in dfiq_instance.scenarios()]
+    question_ids = [question.id for question in dfiq_instance.questions()]
+    benchmarks = {
+        "build_graph": dfiq_instance.build_graph,
+        "add_child_ids": dfiq_instance.add_child_ids,
+        "add_child_tags": dfiq_instance.add_child_tags,
+        "build_indexes": dfiq_instance.build_indexes,
+        "build_closures": dfiq_instance.build_closures,
+        "scenarios": dfiq_instance.scenarios,
+        "facets": dfiq_instance.facets,
+        "questions": dfiq_instance.questions,
+        "questions_with_approaches": lambda: dfiq_instance.questions(
+            include_internal=False, with_approaches_only=True
+        ),
+        "approaches": dfiq_instance.approaches,
+        "tag_index": lambda: dfiq_instance.tag_index,
+        "find": lambda: dfiq_instance.find(tags_any=["Windows", "Linux"]),
+        "find_approaches": lambda: dfiq_instance.find_approaches(processor="Plaso"),
+        "find_questions": lambda: dfiq_instance.find_questions(data_type="Log"),
+        "descendants": lambda: [
+            dfiq_instance.descendants(dfiq_id) for dfiq_id in scenario_ids
+        ],
+        "ancestors": lambda: [
+            dfiq_instance.ancestors(dfiq_id) for dfiq_id in question_ids
+        ],
+        "search": lambda: dfiq_instance.search("synthetic question windows"),
+        "match_artifacts": lambda: dfiq_instance.match_artifacts(
+            [[f"Artifact{i}", f"Artifact{i + 1}"] for i in range(100)]
+        ),
+    }
+    for name, function in benchmarks.items():
+        results[name] = measure(function, repeat)
+
+    if site:
+        with tempfile.TemporaryDirectory() as markdown_output_path:
+            dfiq_instance.markdown_output_path = Path(markdown_output_path)
+            results["generate_site"] = measure(
+                lambda: dfiq_instance.generate_site(
+                    allow_internal=True, incremental=False
+                ),
+                repeat,
+            )
+    return results
+
+
+def get_commit() -> str | None:
+    """Returns the git commit being benchmarked, if known."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print how each benchmark's median time changed from a baseline run."""
+    for size, corpus in results["corpora"].items():
+        baseline_corpus = baseline["corpora"].get(size)
+        if not baseline_corpus:
+            continue
+        for name, result in corpus["results"].items():
+            baseline_result = baseline_corpus["results"].get(name)
+            if not baseline_result or not baseline_result["median_seconds"]:
+                continue
+            ratio = result["median_seconds"] / baseline_result["median_seconds"]
+            print(f"{size} {name}: {ratio:.2f}x the baseline time", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark DFIQ on synthetic corpora of increasing size."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(SIZES),
+        default=["1k", "10k"],
+        help="The corpus sizes to benchmark.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--corpus-dir",
+        help="Where to keep the generated corpora, so they can be reused between "
+        "runs (defaults to a temporary directory).",
+    )
+    parser.add_argument(
+        "--no-site",
+        action="store_true",
+        help="Skip timing full site generation.",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the results to this JSON file (defaults to stdout).",
+    )
+    parser.add_argument(
+        "--compare",
+        help="A JSON file written by an earlier run to compare the results to.",
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    file_path = os.path.abspath(__file__)
+    templates_path = os.path.join(
+        os.path.dirname(os.path.dirname(file_path)), "templates"
+    )
+
+    results = {
+        "version": RESULTS_FORMAT_VERSION,
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "yaml_loader": YAML_LOADER.__name__,
+        "corpora": {},
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = args.corpus_dir or temp_dir
+        for size in args.sizes:
+            yaml_data_path = os.path.join(corpus_dir, size)
+            # Corpora are deterministic, so one generated by an earlier run is reused.
+            if not os.path.isdir(yaml_data_path):
+                partial_path = f"{yaml_data_path}.{os.getpid()}.tmp"
+                generate_corpus(partial_path, components=SIZES[size])
+                os.replace(partial_path, yaml_data_path)
+
+            print(f"Benchmarking the {size} corpus", file=sys.stderr)
+            results["corpora"][size] = {
+                "yaml_data_path": yaml_data_path,
+                "results": benchmark_corpus(
+                    yaml_data_path, templates_path, args.repeat, not args.no_site
+                ),
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
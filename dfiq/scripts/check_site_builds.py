@@ -0,0 +1,131 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import filecmp
+import logging
+import os
+import sys
+import tempfile
+
+from dfiq import DFIQ
+from dfiq.scripts.generate_synthetic_corpus import generate_corpus
+
+# This file should be called from the repository root:
+# PYTHONPATH=. python dfiq/scripts/check_site_builds.py
+#
+# It checks that incrementally building the public and internal sites together
+# (with generate_sites()) gives the same pages as building each from scratch,
+# after edits that make pages switch between being shared and not.
+
+
+def get_differing_pages(site_path: str, expected_site_path: str) -> list[str]:
+    """Returns the pages that are missing or different in a generated site."""
+    differing_pages = []
+    for directory, _, file_names in os.walk(expected_site_path):
+        for file_name in file_names:
+            if file_name.startswith("."):
+                continue
+            expected_path = os.path.join(directory, file_name)
+            page = os.path.relpath(expected_path, expected_site_path)
+            path = os.path.join(site_path, page)
+            if not os.path.exists(path) or not filecmp.cmp(
+                path, expected_path, shallow=False
+            ):
+                differing_pages.append(page)
+    return sorted(differing_pages)
+
+
+def find_only_internal_approach(dfiq_instance: DFIQ) -> str:
+    """Returns an internal Approach whose Question's page is otherwise public."""
+    for approach in dfiq_instance.approaches():
+        if not approach.is_internal:
+            continue
+        question = dfiq_instance.components.get(next(iter(approach.parent_ids)))
+        if not question or question.is_internal:
+            continue
+        other_approaches = [
+            dfiq_instance.components[approach_id]
+            for approach_id in question.approaches
+            if approach_id != approach.id
+        ]
+        if other_approaches and not any(
+            other.is_internal
+            or (
+                isinstance(other.description, dict)
+                and other.description.get("references_internal")
+            )
+            for other in other_approaches
+        ):
+            return approach.id
+    raise ValueError("No suitable internal Approach in the corpus")
+
+
+def main() -> int:
+    logging.getLogger().setLevel(logging.ERROR)
+
+    file_path = os.path.abspath(__file__)
+    templates_path = os.path.join(
+        os.path.dirname(os.path.dirname(file_path)), "templates"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_data_path = os.path.join(temp_dir, "data")
+        public_path = os.path.join(temp_dir, "public")
+        internal_path = os.path.join(temp_dir, "internal")
+        generate_corpus(yaml_data_path, components=500, internal_ratio=0.1)
+
+        def build_sites() -> None:
+            dfiq_instance = DFIQ(yaml_data_path, templates_path=templates_path)
+            dfiq_instance.generate_sites(public_path, internal_path)
+
+        # Removing the only internal Approach of a Question makes its page shared
+        # (copied from the public site); restoring it must render the page again.
+        approach_id = find_only_internal_approach(
+            DFIQ(yaml_data_path, templates_path=templates_path)
+        )
+        approach_path = os.path.join(
+            yaml_data_path, "approaches", f"{approach_id}.yaml"
+        )
+        with open(approach_path, encoding="utf-8") as file:
+            approach_yaml = file.read()
+        build_sites()
+        os.remove(approach_path)
+        build_sites()
+        with open(approach_path, mode="w", encoding="utf-8") as file:
+            file.write(approach_yaml)
+        build_sites()
+
+        failed = False
+        for allow_internal, site_path in [
+            (False, public_path),
+            (True, internal_path),
+        ]:
+            expected_site_path = os.path.join(temp_dir, f"expected-{allow_internal}")
+            DFIQ(
+                yaml_data_path,
+                templates_path=templates_path,
+                markdown_output_path=expected_site_path,
+            ).generate_site(allow_internal=allow_internal, incremental=False)
+            differing_pages = get_differing_pages(site_path, expected_site_path)
+            site_name = "internal" if allow_internal else "public"
+            for page in differing_pages:
+                print(f"The {site_name} site's {page} is stale", file=sys.stderr)
+            failed = failed or bool(differing_pages)
+
+    print("FAILED" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,22 +12,82 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import argparse
+import logging
 import os
 from dfiq import DFIQ
 
-
 # This file should be called from the repository root:
-# PYTHONPATH=. python dfiq/scripts/generate_site_markdown.py
+# PYTHONPATH=. python dfiq/scripts/generate_site_markdown.py [--workers N] [--profile]
+#     [--internal-output-path PATH]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate the DFIQ site's Markdown.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Render pages using a pool of this many worker processes.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Log the time spent in each phase of loading, and the slowest files.",
+    )
+    parser.add_argument(
+        "--internal-output-path",
+        help="Also generate the internal site (including internal components) here, "
+        "in the same build as the public one.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG, format="%(filename)s | %(levelname)s | %(message)s"
+    )
+
+    file_path = os.path.abspath(__file__)
+    templates_dir = os.path.join(
+        os.path.dirname(os.path.dirname(file_path)), "templates"
+    )
+    dfiq_instance = DFIQ(
+        templates_path=templates_dir,
+        markdown_output_path="site/docs",
+        per_file_stats=args.profile,
+    )
+
+    if args.profile:
+        stats = dfiq_instance.stats
+        for phase, seconds in sorted(
+            stats.timings.items(), key=lambda x: x[1], reverse=True
+        ):
+            logging.info(f"Load phase {phase}: {seconds * 1000:.1f} ms")
+        for counter, value in sorted(stats.counters.items()):
+            logging.info(f"Load counter {counter}: {value}")
+        file_timings = stats.file_timings or {}
+        slowest_files = sorted(file_timings.items(), key=lambda x: x[1], reverse=True)
+        for yaml_file_path, seconds in slowest_files[:10]:
+            logging.info(f"Loaded {yaml_file_path} in {seconds * 1000:.1f} ms")
 
-file_path = os.path.abspath(__file__)
-templates_dir = os.path.join(os.path.dirname(os.path.dirname(file_path)), 'templates')
-dfiq_instance = DFIQ(templates_path=templates_dir, markdown_output_path="site/docs")
+    # Only pages whose inputs changed since the last run are rendered and written.
+    if args.internal_output_path:
+        site_timings = dfiq_instance.generate_sites(
+            "site/docs", args.internal_output_path, workers=args.workers
+        )
+        page_timings = {
+            f"{site}/{page}": seconds
+            for site, timings in site_timings.items()
+            for page, seconds in timings.items()
+        }
+    else:
+        page_timings = dfiq_instance.generate_site(workers=args.workers)
 
-for scenario in dfiq_instance.scenarios():
-    dfiq_instance.generate_scenario_md(scenario.id)
+    slowest_pages = sorted(page_timings.items(), key=lambda x: x[1], reverse=True)
+    for page, seconds in slowest_pages[:10]:
+        logging.info(f"Generated {page} in {seconds * 1000:.1f} ms")
+    logging.info(
+        f"Generated {len(page_timings)} pages in {sum(page_timings.values()):.2f} s"
+    )
 
-for question in dfiq_instance.questions():
-    dfiq_instance.generate_question_md(question.id)
 
-dfiq_instance.generate_question_index_md()
-dfiq_instance.generate_approach_glossary_md()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import math
+import os
+import random
+import uuid
+
+import yaml
+
+# Use the C-accelerated YAML emitter when available; large corpora have many files.
+DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# This file should be called from the repository root:
+# PYTHONPATH=. python dfiq/scripts/generate_synthetic_corpus.py OUTPUT_PATH [--components N]
+
+TAGS = [
+    "Windows",
+    "macOS",
+    "Linux",
+    "Cloud",
+    "Web Browser",
+    "Plaso",
+    "SQLite",
+    "Authentication",
+    "Persistence",
+    "Exfiltration",
+]
+DATA_TYPES = ["ForensicArtifact", "ForensicArtifact", "ForensicArtifact", "Log"]
+PROCESSORS = {
+    "Plaso": ["OpenSearch", "Timesketch", "Python Notebook"],
+    "Velociraptor": ["VQL"],
+    "BigQuery": ["SQL"],
+}
+STEP_TYPES = {
+    "OpenSearch": "opensearch-query",
+    "Timesketch": "opensearch-query",
+    "Python Notebook": "pandas",
+    "VQL": "vql",
+    "SQL": "sql",
+}
+VARIABLES = ["{hostname}", "{user_name}", "{start_time}", "{end_time}", "{file_path}"]
+
+# IDs have four digits, and those starting with 0 are internal, so there can be at
+# most 9000 public and 1000 internal components of each type. Approach IDs add a
+# two-digit suffix, where 00-09 are internal and 10-99 are public.
+MAX_PUBLIC_IDS = 9000
+MAX_INTERNAL_IDS = 1000
+MAX_APPROACHES_PER_QUESTION = 90
+
+
+def allocate_ids(prefix: str, count: int, internal: list[bool]) -> list[str]:
+    """Returns `count` unique IDs like "Q1234", internal where `internal` says so."""
+    if internal.count(True) > MAX_INTERNAL_IDS or (
+        internal.count(False) > MAX_PUBLIC_IDS
+    ):
+        raise ValueError(
+            f"Too many {prefix} components ({count}); use larger fan-outs to reach "
+            f"the same total with fewer of them"
+        )
+    next_public = 1000
+    next_internal = 0
+    ids = []
+    for is_internal in internal:
+        if is_internal:
+            ids.append(f"{prefix}{next_internal:04d}")
+            next_internal += 1
+        else:
+            ids.append(f"{prefix}{next_public:04d}")
+            next_public += 1
+    return ids
+
+
+def write_component(output_path: str, subdirectory: str, component: dict) -> None:
+    """Write one component to its own YAML file."""
+    file_path = os.path.join(output_path, subdirectory, f"{component['id']}.yaml")
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        file.write("---\n")
+        yaml.dump(component, file, Dumper=DUMPER, sort_keys=False)
+
+
+def make_view(rng: random.Random, artifacts: int) -> dict:
+    """Returns a random, schema-valid Approach `view`."""
+    data = [
+        {"type": rng.choice(DATA_TYPES), "value": f"Artifact{rng.randrange(artifacts)}"}
+        for _ in range(rng.randint(1, 3))
+    ]
+    data.append({"type": "description", "value": "Data needed for this Approach."})
+
+    processors = []
+    for name in rng.sample(sorted(PROCESSORS), rng.randint(1, 2)):
+        analysis = []
+        for analysis_name in PROCESSORS[name]:
+            steps = [
+                {
+                    "description": f"Step {i + 1}",
+                    "type": STEP_TYPES[analysis_name],
+                    "value": f"data_type:example_{i} AND {rng.choice(VARIABLES)}",
+                }
+                for i in range(rng.randint(1, 3))
+            ]
+            analysis.append({"name": analysis_name, "steps": steps})
+        processors.append({"name": name, "analysis": analysis})
+
+    return {
+        "data": data,
+        "notes": {"covered": ["What this covers."], "not_covered": ["Caveats."]},
+        "processors": processors,
+    }
+
+
+def generate_corpus(
+    output_path: str,
+    components: int = 1000,
+    facets_per_scenario: int = 4,
+    questions_per_facet: int = 5,
+    approaches_per_question: int = 10,
+    extra_parents: int = 1,
+    internal_ratio: float = 0.05,
+    artifacts: int = 200,
+    seed: int = 0,
+) -> dict[str, int]:
+    """Write a synthetic, schema-valid DFIQ corpus of about `components` components.
+
+    The corpus has the same layout as a real one (scenarios/, facets/, questions/,
+    and approaches/ subdirectories), and the same number of Scenarios is repeated
+    until it reaches the requested size. The output is deterministic for a seed.
+    Existing files with the same names are overwritten, so use an empty directory.
+
+    Args:
+        output_path (str): The directory to write the corpus to.
+        components (int): The approximate total number of components.
+        facets_per_scenario (int): The number of Facets created under each Scenario.
+        questions_per_facet (int): The number of Questions created under each Facet.
+        approaches_per_question (int): The number of Approaches for each Question.
+        extra_parents (int): The number of additional, random parents given to
+            each Facet and Question, so the hierarchy is a DAG and not a tree.
+        internal_ratio (float): The fraction of components that are internal.
+        artifacts (int): The number of distinct data values used by Approaches.
+        seed (int): The random seed.
+
+    Returns:
+        The number of components written, by type.
+    """
+    if approaches_per_question > MAX_APPROACHES_PER_QUESTION:
+        raise ValueError(
+            f"At most {MAX_APPROACHES_PER_QUESTION} Approaches per Question are supported"
+        )
+
+    rng = random.Random(seed)
+    per_scenario = 1 + facets_per_scenario * (
+        1 + questions_per_facet * (1 + approaches_per_question)
+    )
+    scenarios = max(1, math.ceil(components / per_scenario))
+    facets = scenarios * facets_per_scenario
+    questions = facets * questions_per_facet
+
+    def is_internal(count: int) -> list[bool]:
+        return [rng.random() < internal_ratio for _ in range(count)]
+
+    scenario_ids = allocate_ids("S", scenarios, is_internal(scenarios))
+    facet_ids = allocate_ids("F", facets, is_internal(facets))
+    question_ids = allocate_ids("Q", questions, is_internal(questions))
+
+    for subdirectory in ["scenarios", "facets", "questions", "approaches"]:
+        os.makedirs(os.path.join(output_path, subdirectory), exist_ok=True)
+
+    def make_component(dfiq_id: str, dfiq_type: str, name: str) -> dict:
+        return {
+            "name": name,
+            "type": dfiq_type,
+            "description": f"A synthetic {dfiq_type} for benchmarking.",
+            "id": dfiq_id,
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "internal": dfiq_id[1] == "0",
+            "dfiq_version": "1.0.0",
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+        }
+
+    for i, scenario_id in enumerate(scenario_ids):
+        write_component(
+            output_path,
+            "scenarios",
+            make_component(scenario_id, "scenario", f"Synthetic Scenario {i}"),
+        )
+
+    def get_parent_ids(i: int, fan_out: int, candidate_ids: list[str]) -> list[str]:
+        parent_ids = {candidate_ids[i // fan_out]}
+        for _ in range(extra_parents):
+            parent_ids.add(rng.choice(candidate_ids))
+        return sorted(parent_ids)
+
+    for i, facet_id in enumerate(facet_ids):
+        facet = make_component(facet_id, "facet", f"Synthetic Facet {i}")
+        facet["parent_ids"] = get_parent_ids(i, facets_per_scenario, scenario_ids)
+        write_component(output_path, "facets", facet)
+
+    approaches = 0
+    for i, question_id in enumerate(question_ids):
+        question = make_component(question_id, "question", f"Synthetic Question {i}?")
+        question["parent_ids"] = get_parent_ids(i, questions_per_facet, facet_ids)
+        write_component(output_path, "questions", question)
+
+        next_public, next_internal = 10, 0
+        for _ in range(approaches_per_question):
+            if rng.random() < internal_ratio and next_internal < 10:
+                approach_id = f"{question_id}.{next_internal:02d}"
+                next_internal += 1
+            else:
+                approach_id = f"{question_id}.{next_public}"
+                next_public += 1
+            approach = make_component(
+                approach_id, "approach", f"Synthetic Approach {approach_id}"
+            )
+            approach["internal"] = approach_id[1] == "0" or approach_id[6] == "0"
+            approach["description"] = {
+                "details": "How to answer the Question.",
+                "references": ["https://example.com/reference"],
+            }
+            approach["view"] = make_view(rng, artifacts)
+            write_component(output_path, "approaches", approach)
+            approaches += 1
+
+    return {
+        "scenarios": scenarios,
+        "facets": facets,
+        "questions": questions,
+        "approaches": approaches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic DFIQ corpus for benchmarking."
+    )
+    parser.add_argument("output_path", help="The directory to write the corpus to.")
+    parser.add_argument(
+        "--components",
+        type=int,
+        default=1000,
+        help="The approximate total number of components (like 1000, 10000, 100000).",
+    )
+    parser.add_argument("--facets-per-scenario", type=int, default=4)
+    parser.add_argument("--questions-per-facet", type=int, default=5)
+    parser.add_argument("--approaches-per-question", type=int, default=10)
+    parser.add_argument(
+        "--extra-parents",
+        type=int,
+        default=1,
+        help="Additional random parents for each Facet and Question.",
+    )
+    parser.add_argument("--internal-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate_corpus(
+        args.output_path,
+        components=args.components,
+        facets_per_scenario=args.facets_per_scenario,
+        questions_per_facet=args.questions_per_facet,
+        approaches_per_question=args.approaches_per_question,
+        extra_parents=args.extra_parents,
+        internal_ratio=args.internal_ratio,
+        seed=args.seed,
+    )
+    print(
+        f"Wrote {sum(counts.values())} components to {args.output_path}: "
+        + ", ".join(f"{count} {name}" for name, count in counts.items())
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import heapq
+import json
+import math
+import re
+from pathlib import Path
+from typing import Iterable
+
+# Bump this whenever the layout of a saved search index changes.
+SEARCH_INDEX_FORMAT_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# How much a term counts toward a document's score, by the field it was found in.
+FIELD_WEIGHTS = {"id": 3, "name": 3, "tags": 2, "description": 1, "view": 1}
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _iter_strings(value) -> Iterable[str]:
+    """Yield every string in a (possibly nested) structure of dicts and lists."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+class SearchIndex(object):
+    """An in-process full-text index over DFIQ components.
+
+    Components are ranked with BM25. The index covers each component's ID, name,
+    description, and tags, and for Approaches, every string in their `view` (like
+    ForensicArtifact names, processor names, and analysis step queries). The last
+    term of a query also matches as a prefix, to support search-as-you-type.
+
+    Attributes:
+        doc_ids (list[str]): The IDs of the indexed components.
+        doc_types (list[str]): The types of the indexed components.
+        doc_lengths (list[int]): The weighted number of terms in each component.
+        postings (dict): Maps each term to a list of [document number, weighted
+            term frequency] pairs, ordered by document number.
+    """
+
+    def __init__(
+        self,
+        doc_ids: list[str],
+        doc_types: list[str],
+        doc_lengths: list[int],
+        postings: dict[str, list[list[int]]],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.doc_ids = doc_ids
+        self.doc_types = doc_types
+        self.doc_lengths = doc_lengths
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        self.terms = sorted(self.postings)
+        self.average_doc_length = (
+            sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0
+        )
+        # BM25 scores only depend on the term and the document, so compute each
+        # posting's score ("impact") once, leaving queries to just add them up.
+        self.impacts = {}
+        for term, docs in self.postings.items():
+            idf = math.log(
+                1 + (len(self.doc_ids) - len(docs) + 0.5) / (len(docs) + 0.5)
+            )
+            self.impacts[term] = [
+                (
+                    doc_number,
+                    idf
+                    * frequency
+                    * (self.k1 + 1)
+                    / (frequency + self.k1 * self._get_length_norm(doc_number)),
+                )
+                for doc_number, frequency in docs
+            ]
+
+    def _get_length_norm(self, doc_number: int) -> float:
+        """Returns BM25's document length normalization factor for a document."""
+        return (
+            1
+            - self.b
+            + self.b * (self.doc_lengths[doc_number] / self.average_doc_length)
+        )
+
+    @classmethod
+    def from_components(cls, components: Iterable) -> "SearchIndex":
+        """Build a search index from DFIQ components."""
+        doc_ids = []
+        doc_types = []
+        doc_lengths = []
+        postings = {}
+        for doc_number, component in enumerate(sorted(components, key=lambda x: x.id)):
+            fields = {
+                "id": [component.id],
+                "name": [component.name],
+                "tags": component.all_tags,
+                "description": list(_iter_strings(component.description)),
+                "view": list(_iter_strings(getattr(component, "view", None))),
+            }
+            term_frequencies = {}
+            for field, texts in fields.items():
+                for text in texts:
+                    for token in tokenize(text):
+                        term_frequencies[token] = (
+                            term_frequencies.get(token, 0) + FIELD_WEIGHTS[field]
+                        )
+
+            doc_ids.append(component.id)
+            doc_types.append(component.type)
+            doc_lengths.append(sum(term_frequencies.values()))
+            for term, frequency in term_frequencies.items():
+                postings.setdefault(term, []).append([doc_number, frequency])
+
+        return cls(doc_ids, doc_types, doc_lengths, postings)
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 10,
+        component_type: str | None = None,
+        prefix: bool = True,
+        max_prefix_terms: int = 50,
+    ) -> list[tuple[str, float]]:
+        """Search the index.
+
+        Args:
+            query (str): The search terms.
+            limit (int, optional): The maximum number of results to return.
+            component_type (str, optional): Only return components of this type.
+            prefix (bool): Whether the last query term also matches as a prefix.
+            max_prefix_terms (int): The maximum number of terms a prefix expands to.
+
+        Returns:
+            A list of (component ID, score) tuples, best match first.
+        """
+        query_terms = tokenize(query)
+        if not query_terms:
+            return []
+
+        # Each query term contributes its best-matching expansion to a document.
+        scores = {}
+        for position, query_term in enumerate(query_terms):
+            matching_terms = [query_term] if query_term in self.postings else []
+            if prefix and position == len(query_terms) - 1:
+                matching_terms = self.expand_prefix(query_term, max_prefix_terms)
+
+            term_scores = {}
+            for term in matching_terms:
+                for doc_number, score in self.impacts[term]:
+                    if score > term_scores.get(doc_number, 0):
+                        term_scores[doc_number] = score
+
+            for doc_number, score in term_scores.items():
+                scores[doc_number] = scores.get(doc_number, 0) + score
+
+        results = [
+            (self.doc_ids[doc_number], score)
+            for doc_number, score in scores.items()
+            if not component_type or self.doc_types[doc_number] == component_type
+        ]
+        if limit is None:
+            return sorted(results, key=lambda x: (-x[1], x[0]))
+        return heapq.nsmallest(limit, results, key=lambda x: (-x[1], x[0]))
+
+    def expand_prefix(self, prefix: str, max_terms: int = 50) -> list[str]:
+        """Returns the indexed terms starting with a prefix (the exact term first)."""
+        start = bisect.bisect_left(self.terms, prefix)
+        expanded = []
+        for term in self.terms[start : start + max_terms]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def to_dict(self) -> dict:
+        """Returns a JSON-serializable representation of the index."""
+        return {
+            "version": SEARCH_INDEX_FORMAT_VERSION,
+            "doc_ids": self.doc_ids,
+            "doc_types": self.doc_types,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+            "k1": self.k1,
+            "b": self.b,
+        }
+
+    @classmethod
+    def from_dict(cls, index_dict: dict) -> "SearchIndex":
+        """Create an index from the output of to_dict()."""
+        if index_dict.get("version") != SEARCH_INDEX_FORMAT_VERSION:
+            raise ValueError("Unsupported search index version")
+        return cls(
+            index_dict["doc_ids"],
+            index_dict["doc_types"],
+            index_dict["doc_lengths"],
+            index_dict["postings"],
+            k1=index_dict["k1"],
+            b=index_dict["b"],
+        )
+
+    def save(self, path: Path | str) -> None:
+        """Save the index to a JSON file."""
+        Path(path).write_text(
+            json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, path: Path | str) -> "SearchIndex":
+        """Load an index saved with save()."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
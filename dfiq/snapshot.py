@@ -0,0 +1,253 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+# Bump this whenever the layout of a snapshot changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+SNAPSHOT_FORMATS = ("jsonl", "sqlite")
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+SQLITE_SCHEMA = """
+CREATE TABLE snapshot_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE components (
+    id TEXT PRIMARY KEY,
+    uuid TEXT,
+    type TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    is_internal INTEGER NOT NULL,
+    view TEXT
+);
+CREATE TABLE tags (
+    component_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (component_id, position)
+);
+CREATE INDEX tags_by_tag ON tags (tag);
+CREATE TABLE edges (
+    parent_id TEXT NOT NULL,
+    child_id TEXT NOT NULL,
+    PRIMARY KEY (parent_id, child_id)
+);
+CREATE INDEX edges_by_child ON edges (child_id);
+CREATE TABLE approach_steps (
+    approach_id TEXT NOT NULL,
+    processor TEXT,
+    analysis TEXT,
+    position INTEGER NOT NULL,
+    type TEXT,
+    value TEXT,
+    description TEXT
+);
+CREATE INDEX approach_steps_by_approach ON approach_steps (approach_id);
+"""
+
+
+def component_to_record(component) -> dict:
+    """Returns a component's own fields, in the same form as its YAML file."""
+    record = {
+        "id": component.id,
+        "uuid": component.uuid,
+        "type": component.type,
+        "name": component.name,
+        "description": component.description,
+        "tags": list(component.tags),
+        "is_internal": component.is_internal,
+    }
+    if component.type == "approach":
+        record["view"] = component.view
+    else:
+        record["parent_ids"] = sorted(component.parent_ids)
+    return record
+
+
+def write_snapshot(components: Iterable, path: Path | str, format: str) -> None:
+    """Atomically write a snapshot of the components to a file.
+
+    A snapshot holds every component's own fields (the same ones as in its YAML
+    file), so it can be loaded again without PyYAML or Yamale. The "jsonl" format
+    is a header line followed by one component per line. The "sqlite" format is a
+    database with tables of components, tags, edges (from parent to child), and
+    Approach analysis steps, for querying with SQL.
+
+    Args:
+        components (Iterable): The components to write.
+        path (Path | str): The snapshot file to write.
+        format (str): The snapshot format ("jsonl" or "sqlite").
+    """
+    if format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format {format}")
+
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    records = [component_to_record(component) for component in components]
+    if format == "jsonl":
+        _write_jsonl(records, temp_path)
+    else:
+        _write_sqlite(records, temp_path)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: Path | str) -> list[dict]:
+    """Read the component records from a snapshot file (in either format)."""
+    with open(path, mode="rb") as file:
+        magic = file.read(len(SQLITE_MAGIC))
+    if magic == SQLITE_MAGIC:
+        return _read_sqlite(path)
+    return _read_jsonl(path)
+
+
+def _write_jsonl(records: list[dict], path: Path) -> None:
+    """Write component records as JSON Lines, after a header line."""
+    with open(path, mode="w", encoding="utf-8") as file:
+        header = {"format": "dfiq-snapshot", "version": SNAPSHOT_FORMAT_VERSION}
+        file.write(json.dumps(header) + "\n")
+        for record in records:
+            file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _read_jsonl(path: Path | str) -> list[dict]:
+    """Read component records written by _write_jsonl()."""
+    with open(path, mode="r", encoding="utf-8") as file:
+        header = json.loads(file.readline() or "{}")
+        if (
+            header.get("format") != "dfiq-snapshot"
+            or header.get("version") != SNAPSHOT_FORMAT_VERSION
+        ):
+            raise ValueError(f"{path} is not a supported DFIQ snapshot")
+        return [json.loads(line) for line in file]
+
+
+def _write_sqlite(records: list[dict], path: Path) -> None:
+    """Write component records to a new SQLite database."""
+    import sqlite3
+
+    if path.exists():
+        path.unlink()
+
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SQLITE_SCHEMA)
+        connection.execute(
+            "INSERT INTO snapshot_info VALUES ('version', ?)",
+            (str(SNAPSHOT_FORMAT_VERSION),),
+        )
+        connection.executemany(
+            "INSERT INTO components VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    record["id"],
+                    record["uuid"],
+                    record["type"],
+                    record["name"],
+                    json.dumps(record["description"]),
+                    int(record["is_internal"]),
+                    json.dumps(record["view"]) if "view" in record else None,
+                )
+                for record in records
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO tags VALUES (?, ?, ?)",
+            [
+                (record["id"], position, tag)
+                for record in records
+                for position, tag in enumerate(record["tags"])
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO edges VALUES (?, ?)",
+            [
+                (parent_id, record["id"])
+                for record in records
+                for parent_id in record.get("parent_ids", [record["id"].split(".")[0]])
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO approach_steps VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (record["id"], processor, analysis, position) + step
+                for record in records
+                if "view" in record
+                for processor, analysis, position, step in _iter_steps(record["view"])
+            ],
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _iter_steps(view: dict | None) -> Iterable[tuple]:
+    """Yield (processor, analysis, position, (type, value, description)) steps."""
+    for processor in (view or {}).get("processors") or []:
+        for analysis in processor.get("analysis") or []:
+            for position, step in enumerate(analysis.get("steps") or []):
+                yield processor.get("name"), analysis.get("name"), position, (
+                    step.get("type"),
+                    step.get("value"),
+                    step.get("description"),
+                )
+
+
+def _read_sqlite(path: Path | str) -> list[dict]:
+    """Read component records written by _write_sqlite()."""
+    import sqlite3
+
+    connection = sqlite3.connect(f"file:{Path(path).resolve()}?mode=ro", uri=True)
+    try:
+        version = connection.execute(
+            "SELECT value FROM snapshot_info WHERE key = 'version'"
+        ).fetchone()
+        if not version or version[0] != str(SNAPSHOT_FORMAT_VERSION):
+            raise ValueError(f"{path} is not a supported DFIQ snapshot")
+
+        records = {}
+        for row in connection.execute("SELECT * FROM components ORDER BY rowid"):
+            dfiq_id, uuid, dfiq_type, name, description, is_internal, view = row
+            record = {
+                "id": dfiq_id,
+                "uuid": uuid,
+                "type": dfiq_type,
+                "name": name,
+                "description": json.loads(description),
+                "tags": [],
+                "is_internal": bool(is_internal),
+            }
+            if dfiq_type == "approach":
+                record["view"] = json.loads(view)
+            else:
+                record["parent_ids"] = []
+            records[dfiq_id] = record
+
+        for dfiq_id, tag in connection.execute(
+            "SELECT component_id, tag FROM tags ORDER BY component_id, position"
+        ):
+            records[dfiq_id]["tags"].append(tag)
+
+        for parent_id, child_id in connection.execute(
+            "SELECT parent_id, child_id FROM edges ORDER BY child_id, parent_id"
+        ):
+            if "parent_ids" in records[child_id]:
+                records[child_id]["parent_ids"].append(parent_id)
+    finally:
+        connection.close()
+    return list(records.values())
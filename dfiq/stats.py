@@ -0,0 +1,121 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import time
+from typing import Callable, Iterator
+
+
+class LoadStats(object):
+    """Timers and counters for loading a DFIQ knowledge base.
+
+    Phases are timed separately and may be nested (like "parse" within "load"), so
+    their times don't add up. When YAML files are loaded by worker processes, the
+    workers' times are summed, so they can exceed the wall-clock time.
+
+    Phases:
+        load: Everything done while creating the DFIQ instance.
+        read, parse, validate, convert: Loading YAML files.
+        cache_read, cache_write, snapshot_read: Reading and writing caches and
+            snapshots.
+        graph, child_ids, child_tags, indexes, closures, reload: The DFIQ
+            methods of the same names.
+
+    Counters:
+        files_read, bytes_read: The YAML files read (and their total size).
+        parse_failures, validation_failures: The YAML files that failed to parse
+            or to validate against their schema.
+        components_loaded: The components converted from YAML files or snapshots.
+        cache_hits: The YAML files whose components were reused from the cache.
+        edges_added: The parent-child edges added to the graph.
+        files_reloaded: The YAML files passed to reload().
+
+    Attributes:
+        timings (dict): Maps each phase to the total number of seconds spent in it.
+        counters (dict): Maps each counter to its value.
+        file_timings (dict, optional): If per-file timing is enabled, maps each YAML
+            file loaded to the number of seconds spent loading it.
+        hook (Callable, optional): Called as hook(kind, name, value) each time a
+            phase ends (kind "phase", with the seconds spent), a counter is
+            incremented (kind "counter", with the amount), or a file is timed (kind
+            "file", with the path as the name and the seconds spent). Use it to
+            forward measurements to a metrics system. It is not pickled.
+    """
+
+    def __init__(self, per_file: bool = False, hook: Callable | None = None) -> None:
+        self.timings = {}
+        self.counters = {}
+        self.file_timings = {} if per_file else None
+        self.hook = hook
+
+    def __getstate__(self) -> dict:
+        """Pickle everything except the hook (which may not be picklable)."""
+        state = self.__dict__.copy()
+        state["hook"] = None
+        return state
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of code as part of a phase."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start_time)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add to the time spent in a phase."""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if self.hook:
+            self.hook("phase", name, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self.hook:
+            self.hook("counter", name, amount)
+
+    def add_file_time(self, path: str, seconds: float) -> None:
+        """Record the time spent loading a file, if per-file timing is enabled."""
+        if self.file_timings is None:
+            return
+        self.file_timings[path] = self.file_timings.get(path, 0.0) + seconds
+        if self.hook:
+            self.hook("file", path, seconds)
+
+    def merge(self, stats: dict) -> None:
+        """Add the measurements from another instance's to_dict()."""
+        for name, seconds in stats["timings"].items():
+            self.add_time(name, seconds)
+        for name, amount in stats["counters"].items():
+            self.count(name, amount)
+        for path, seconds in (stats["file_timings"] or {}).items():
+            self.add_file_time(path, seconds)
+
+    def reset(self) -> None:
+        """Clear all measurements."""
+        self.timings = {}
+        self.counters = {}
+        if self.file_timings is not None:
+            self.file_timings = {}
+
+    def to_dict(self) -> dict:
+        """Returns the measurements as a JSON-serializable dict."""
+        return {
+            "timings": dict(self.timings),
+            "counters": dict(self.counters),
+            "file_timings": (
+                dict(self.file_timings) if self.file_timings is not None else None
+            ),
+        }
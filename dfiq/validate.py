@@ -0,0 +1,288 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import os
+import time
+from pathlib import Path
+
+from .dfiq import DFIQ, _get_yaml_loader
+
+# Bump this whenever the layout of the validation report changes.
+REPORT_FORMAT_VERSION = 1
+
+# The subdirectory holding each component type's YAML files, and the type of
+# component its parents must be (Approaches' parent is implied by their ID).
+SUBDIRECTORIES = {
+    "Scenario": "scenarios",
+    "Facet": "facets",
+    "Question": "questions",
+    "Approach": "approaches",
+}
+PARENT_TYPES = {
+    "Scenario": None,
+    "Facet": "Scenario",
+    "Question": "Facet",
+    "Approach": "Question",
+}
+
+
+def validate_corpus(yaml_data_path: Path | str, workers: int | None = None) -> dict:
+    """Validate every DFIQ YAML file in a corpus, and the references between them.
+
+    Each file is parsed once and validated against its type's compiled schema, by a
+    pool of worker processes if `workers` is set. The components that pass are then
+    checked for duplicate IDs and UUIDs, parents that don't exist (or are of the
+    wrong type), and cycles. Parents may be given by ID or UUID. All of these
+    checks take time linear in the size of the corpus.
+
+    Args:
+        yaml_data_path (Path | str): The base path holding the DFIQ YAML files.
+        workers (int, optional): The number of worker processes used to parse and
+            validate files. If not set (or 1), files are validated serially.
+
+    Returns:
+        A JSON-serializable report, with:
+            valid (bool): Whether no errors were found.
+            files (int): The number of YAML files checked.
+            components (dict): The number of valid components of each type.
+            errors (list[dict]): Each error's `check` ("parse", "schema",
+                "duplicate_id", "duplicate_uuid", "dangling_parent", "parent_type",
+                or "cycle"), `path`, `id` (if known), and `message`.
+            seconds (float): The time spent validating.
+    """
+    start_time = time.perf_counter()
+    yaml_files = []
+    for dfiq_type, subdirectory in SUBDIRECTORIES.items():
+        directory = os.path.join(yaml_data_path, subdirectory)
+        if not os.path.isdir(directory):
+            continue
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(".yaml") and not file_name.endswith(
+                ("-template.yaml", "-blank.yaml")
+            ):
+                yaml_files.append((dfiq_type, os.path.join(directory, file_name)))
+
+    import yamale
+
+    schemas = {
+        dfiq_type: yamale.make_schema(
+            DFIQ._get_dfiq_file("utils", f"{dfiq_type.lower()}_spec.yaml")
+        )
+        for dfiq_type in SUBDIRECTORIES
+    }
+    results = _validate_files(yaml_files, schemas, workers)
+
+    errors = []
+    components = []
+    for file_errors, component in results:
+        errors.extend(file_errors)
+        if component:
+            components.append(component)
+    errors.extend(_check_references(components))
+
+    counts = {dfiq_type: 0 for dfiq_type in SUBDIRECTORIES}
+    for component in components:
+        counts[component["type"]] += 1
+    return {
+        "version": REPORT_FORMAT_VERSION,
+        "yaml_data_path": str(yaml_data_path),
+        "valid": not errors,
+        "files": len(yaml_files),
+        "components": counts,
+        "errors": errors,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def _validate_files(
+    yaml_files: list[tuple[str, str]], schemas: dict, workers: int | None
+) -> list[tuple[list, dict | None]]:
+    """Validate (dfiq_type, yaml_file_path) pairs, returning results in order."""
+    if not workers or workers <= 1 or len(yaml_files) <= 1:
+        _init_validate_worker(schemas)
+        return _validate_files_chunk(yaml_files)
+
+    # Use a few chunks per worker so uneven file sizes balance out.
+    chunk_size = max(1, math.ceil(len(yaml_files) / (workers * 4)))
+    chunks = [
+        yaml_files[i : i + chunk_size] for i in range(0, len(yaml_files), chunk_size)
+    ]
+
+    import concurrent.futures
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_validate_worker,
+        initargs=(schemas,),
+    ) as executor:
+        for chunk_results in executor.map(_validate_files_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def _check_references(components: list[dict]) -> list[dict]:
+    """Check valid components for duplicates, dangling parents, and cycles."""
+    errors = []
+
+    def add_error(check: str, component: dict, message: str) -> None:
+        errors.append(
+            {
+                "check": check,
+                "path": component["path"],
+                "id": component["id"],
+                "message": message,
+            }
+        )
+
+    # The first file (in type and file name order) with an ID or UUID keeps it.
+    by_id = {}
+    by_uuid = {}
+    for component in components:
+        first = by_id.setdefault(component["id"], component)
+        if first is not component:
+            add_error(
+                "duplicate_id",
+                component,
+                f"{component['id']} is also the ID of {first['path']}",
+            )
+        first = by_uuid.setdefault(component["uuid"], component)
+        if first is not component:
+            add_error(
+                "duplicate_uuid",
+                component,
+                f"{component['uuid']} is also the UUID of {first['path']}",
+            )
+
+    parents = {}
+    for component in components:
+        if by_id[component["id"]] is not component:
+            continue
+        parent_ids = []
+        # A repeated parent ID is only checked (and reported) once.
+        for parent_id in dict.fromkeys(component["parent_ids"]):
+            parent = by_id.get(parent_id) or by_uuid.get(parent_id)
+            if not parent:
+                add_error(
+                    "dangling_parent",
+                    component,
+                    f"Parent {parent_id} is not a valid component",
+                )
+                continue
+            if parent["type"] != PARENT_TYPES[component["type"]]:
+                add_error(
+                    "parent_type",
+                    component,
+                    f"Parent {parent_id} is a {parent['type']}, not a "
+                    f"{PARENT_TYPES[component['type']]}",
+                )
+            parent_ids.append(parent["id"])
+        parents[component["id"]] = parent_ids
+
+    # Only a parent of the wrong type can close a cycle. Find any with one
+    # iterative depth-first pass over the parent edges.
+    visiting, done = set(), set()
+    for dfiq_id in parents:
+        if dfiq_id in done:
+            continue
+        path = [dfiq_id]
+        stack = [iter(parents[dfiq_id])]
+        visiting.add(dfiq_id)
+        while stack:
+            parent_id = next(stack[-1], None)
+            if parent_id is None:
+                stack.pop()
+                done.add(path[-1])
+                visiting.discard(path.pop())
+            elif parent_id in visiting:
+                cycle = path[path.index(parent_id) :] + [parent_id]
+                add_error(
+                    "cycle",
+                    by_id[path[-1]],
+                    f"Parents form a cycle: {' -> '.join(cycle)}",
+                )
+            elif parent_id not in done:
+                path.append(parent_id)
+                stack.append(iter(parents.get(parent_id, ())))
+                visiting.add(parent_id)
+    return errors
+
+
+# State for the worker processes used by _validate_files().
+_worker_schemas = {}
+
+
+def _init_validate_worker(schemas: dict) -> None:
+    """Initialize a worker process for validating DFIQ YAML files."""
+    _worker_schemas.update(schemas)
+
+
+def _validate_files_chunk(
+    yaml_files: list[tuple[str, str]],
+) -> list[tuple[list, dict | None]]:
+    """Parse and validate DFIQ YAML files.
+
+    Returns:
+        For each file, a tuple of its errors and, if it is valid, a dict of its
+        type, path, ID, UUID, and parent IDs.
+    """
+    import yaml
+    import yamale
+
+    results = []
+    for dfiq_type, file_path in yaml_files:
+
+        def error(check: str, message: str, dfiq_id: str | None = None) -> dict:
+            return {
+                "check": check,
+                "path": file_path,
+                "id": dfiq_id,
+                "message": message,
+            }
+
+        try:
+            with open(file_path, mode="rb") as file:
+                yaml_object = yaml.load(file.read(), Loader=_get_yaml_loader())
+        except (OSError, yaml.YAMLError) as e:
+            results.append(([error("parse", str(e))], None))
+            continue
+
+        # Mirror yamale.make_data(), which returns an empty dict for empty files.
+        if yaml_object is None:
+            yaml_object = {}
+        try:
+            yamale.validate(_worker_schemas[dfiq_type], [(yaml_object, file_path)])
+        except yamale.YamaleError as e:
+            dfiq_id = yaml_object.get("id") if isinstance(yaml_object, dict) else None
+            messages = [message for result in e.results for message in result.errors]
+            results.append(
+                ([error("schema", message, dfiq_id) for message in messages], None)
+            )
+            continue
+
+        dfiq_id = yaml_object["id"]
+        if dfiq_type == "Approach":
+            parent_ids = [dfiq_id.split(".")[0]]
+        else:
+            parent_ids = yaml_object.get("parent_ids") or []
+        component = {
+            "type": dfiq_type,
+            "path": file_path,
+            "id": dfiq_id,
+            "uuid": yaml_object["uuid"],
+            "parent_ids": parent_ids,
+        }
+        results.append(([], component))
+    return results
@@ -0,0 +1,153 @@
+# Copyright 2024 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ApproachViewModel(object):
+    """The values shown for an Approach on its Question's page.
+
+    Attributes:
+        id (str): The Approach's ID.
+        name (str): The Approach's name.
+        is_internal (bool): Whether the Approach is internal.
+        anchor (str): The anchor of the Approach's section on the Question page.
+        summary (str): The first paragraph of the Approach's details.
+        tags (tuple[str]): The Approach's own tags.
+        description (dict): The Approach's description.
+        details (str, optional): The Approach's details.
+        references (list[str], optional): The Approach's references.
+        references_internal (list[str], optional): The Approach's internal
+            references, only shown on the internal site.
+        notes (dict, optional): What the Approach covers and does not cover.
+        data (list[dict]): The data the Approach uses, other than descriptions.
+        data_descriptions (list[str]): The descriptions of the data the Approach
+            uses.
+        processors (list[dict]): The Approach's processors, each with its `title`.
+    """
+
+    def __init__(self, approach) -> None:
+        self.id = approach.id
+        self.name = approach.name
+        self.is_internal = approach.is_internal
+        self.anchor = (
+            approach.name.replace(" ", "-").replace("(", "").replace(")", "").lower()
+        )
+        self.tags = approach.tags
+
+        description = approach.description
+        if not isinstance(description, dict):
+            description = {}
+        self.description = approach.description
+        self.details = description.get("details")
+        self.summary = (self.details or "").split("\n\n")[0]
+        self.references = description.get("references")
+        self.references_internal = description.get("references_internal")
+
+        view = approach.view or {}
+        self.notes = view.get("notes")
+        data = view.get("data") or []
+        self.data = [entry for entry in data if entry["type"] != "description"]
+        self.data_descriptions = [
+            entry["value"] for entry in data if entry["type"] == "description"
+        ]
+        self.processors = [
+            dict(processor, title=processor["name"].title())
+            for processor in view.get("processors") or []
+        ]
+
+
+class QuestionViewModel(object):
+    """The values shown for a Question on its own page and on Scenario pages.
+
+    Attributes:
+        id (str): The Question's ID.
+        uuid (str): The Question's UUID.
+        name (str): The Question's name.
+        description (str, optional): The Question's description.
+        is_internal (bool): Whether the Question is internal.
+        sorted_tags (list[str]): The Question's `all_tags`, sorted
+            case-insensitively.
+        link (str, optional): The path of the Question's page, if it has one
+            (that is, if it has Approaches).
+        approaches (list[ApproachViewModel]): All the Question's Approaches.
+        public_approaches (list[ApproachViewModel]): The Question's non-internal
+            Approaches.
+    """
+
+    def __init__(self, question, approaches: list[ApproachViewModel]) -> None:
+        self.id = question.id
+        self.uuid = question.uuid
+        self.name = question.name
+        self.description = question.description
+        self.is_internal = question.is_internal
+        self.sorted_tags = sorted(question.all_tags, key=str.lower)
+        self.link = f"/questions/{question.id}" if question.approaches else None
+        self.approaches = approaches
+        self.public_approaches = [a for a in approaches if not a.is_internal]
+
+    def get_approaches(self, allow_internal: bool) -> list[ApproachViewModel]:
+        """Returns the Approaches shown on the public or internal site."""
+        return self.approaches if allow_internal else self.public_approaches
+
+
+class FacetViewModel(object):
+    """The values shown for a Facet on Scenario pages.
+
+    Attributes:
+        id (str): The Facet's ID.
+        name (str): The Facet's name.
+        description (str, optional): The Facet's description.
+        is_internal (bool): Whether the Facet is internal.
+        questions (list[QuestionViewModel]): All the Facet's Questions.
+        public_questions (list[QuestionViewModel]): The Facet's non-internal
+            Questions.
+    """
+
+    def __init__(self, facet, questions: list[QuestionViewModel]) -> None:
+        self.id = facet.id
+        self.name = facet.name
+        self.description = facet.description
+        self.is_internal = facet.is_internal
+        self.questions = questions
+        self.public_questions = [q for q in questions if not q.is_internal]
+
+    def get_questions(self, allow_internal: bool) -> list[QuestionViewModel]:
+        """Returns the Questions shown on the public or internal site."""
+        return self.questions if allow_internal else self.public_questions
+
+
+class ScenarioViewModel(object):
+    """The values shown on a Scenario's page.
+
+    Attributes:
+        id (str): The Scenario's ID.
+        uuid (str): The Scenario's UUID.
+        name (str): The Scenario's name.
+        description (str, optional): The Scenario's description.
+        is_internal (bool): Whether the Scenario is internal.
+        facets (list[FacetViewModel]): All the Scenario's Facets.
+        public_facets (list[FacetViewModel]): The Scenario's non-internal Facets.
+    """
+
+    def __init__(self, scenario, facets: list[FacetViewModel]) -> None:
+        self.id = scenario.id
+        self.uuid = scenario.uuid
+        self.name = scenario.name
+        self.description = scenario.description
+        self.is_internal = scenario.is_internal
+        self.facets = facets
+        self.public_facets = [f for f in facets if not f.is_internal]
+
+    def get_facets(self, allow_internal: bool) -> list[FacetViewModel]:
+        """Returns the Facets shown on the public or internal site."""
+        return self.facets if allow_internal else self.public_facets